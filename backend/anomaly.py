@@ -0,0 +1,180 @@
+import fnmatch
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import numpy as np
+from backend.history import history, is_counter
+from backend.models import AnomalyEvent
+from backend.profiling import timed
+
+# |z| a sample must exceed against both baselines to be flagged.
+Z_THRESHOLD = float(os.getenv("VANTASYS_ANOMALY_Z", "5.0"))
+# Samples a baseline needs before it can flag anything.
+WARMUP = 30
+# EWMA smoothing for the global baseline and for each hour-of-day slot.
+ALPHA = 0.02
+SEASONAL_ALPHA = 0.05
+EVENT_CAPACITY = 1000
+PER_METRIC_CAPACITY = 100
+# Smallest spread (in the metric's own unit) a baseline is given, first match wins. Without it a
+# series that sits at 0 (steal, iowait, an idle NIC) has a near-zero variance and every blip of
+# a fraction of a percent scores as a many-sigma event.
+MIN_DEVIATION = [
+    ("memory.percent", 1.0),
+    ("*_percent", 1.0),              # percentage points
+    ("pressure.*", 1.0),             # PSI avg10, percent
+    ("*.temperature", 1.0),          # degrees C
+    ("*.rpm", 50.0),
+    ("cpu.frequency", 50.0),         # MHz
+    ("*_speed", 65536.0),            # bytes/s
+    ("net.*.bytes_*", 65536.0),      # counters, scored as bytes/s
+    ("memory.*", 16.0 * 1024 ** 2),  # bytes
+]
+DEFAULT_MIN_DEVIATION = 1e-3
+
+
+def min_deviation(name: str) -> float:
+    for pattern, value in MIN_DEVIATION:
+        if fnmatch.fnmatchcase(name, pattern): return value
+    return DEFAULT_MIN_DEVIATION
+
+
+# Per-series state arrays: fill value, dtype, leading dimensions
+_STATE = {
+    "mean": (0.0, np.float64, ()),
+    "var": (0.0, np.float64, ()),
+    "count": (0, np.int64, ()),
+    "s_mean": (0.0, np.float64, (24,)),
+    "s_var": (0.0, np.float64, (24,)),
+    "s_count": (0, np.int64, (24,)),
+    "prev_raw": (np.nan, np.float64, ()),
+    "prev_ts": (np.nan, np.float64, ()),
+    "counter": (False, bool, ()),
+    "min_dev": (DEFAULT_MIN_DEVIATION, np.float64, ()),
+    "active": (False, bool, ()),
+}
+
+
+class AnomalyDetector:
+    """
+    Streaming per-series baselines, updated in O(1) per sample.
+
+    State for every series lives in flat NumPy arrays indexed by series, so one
+    recorded batch (all cores, NICs and disks of a sample) is scored and updated with
+    a handful of vectorised operations. Each series has a global EWMA mean/variance and
+    a 24-slot hour-of-day EWMA profile; a sample is anomalous when it deviates from
+    both, so daily cycles don't trip the detector. Only the transition into an
+    anomalous state is reported.
+    """
+
+    def __init__(self, threshold: float = Z_THRESHOLD):
+        self.threshold = threshold
+        self.index: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._lock = threading.Lock()
+        self._alloc(64)
+        self.events: Deque[AnomalyEvent] = deque(maxlen=EVENT_CAPACITY)
+        self.by_metric: Dict[str, Deque[AnomalyEvent]] = {}
+
+    def _alloc(self, n: int):
+        """(Re)allocate the per-series state arrays for `n` series, keeping existing state."""
+        for field, (fill, dtype, rows) in _STATE.items():
+            arr = np.full(rows + (n,), fill, dtype=dtype)
+            old = getattr(self, field, None)
+            if old is not None: arr[..., :old.shape[-1]] = old
+            setattr(self, field, arr)
+
+    def _indices(self, names: List[str]) -> np.ndarray:
+        idx = []
+        for name in names:
+            i = self.index.get(name)
+            if i is None:
+                i = self.index[name] = len(self.names)
+                self.names.append(name)
+                if i >= len(self.mean): self._alloc(len(self.mean) * 2)
+                # Cumulative counters are differenced into per-second rates before scoring
+                self.counter[i] = is_counter(name)
+                self.min_dev[i] = min_deviation(name)
+            idx.append(i)
+        return np.array(idx, dtype=np.int64)
+
+    @timed("anomaly.observe")
+    def observe(self, ts: float, metrics: Dict[str, float]):
+        names = [n for n, v in metrics.items() if v is not None]
+        if not names: return
+        with self._lock:
+            idx = self._indices(names)
+            x = np.array([metrics[n] for n in names], dtype=np.float64)
+
+            # Counters: score the per-second rate, skip the first sample and resets
+            c = self.counter[idx]
+            if c.any():
+                dt = ts - self.prev_ts[idx]
+                rate = (x - self.prev_raw[idx]) / np.where(dt > 0, dt, np.nan)
+                self.prev_raw[idx[c]] = x[c]
+                self.prev_ts[idx[c]] = ts
+                x = np.where(c, np.where(rate >= 0, rate, np.nan), x)
+            valid = ~np.isnan(x)
+            idx, x = idx[valid], x[valid]
+            hour = time.localtime(ts).tm_hour
+
+            mean, var, count = self.mean[idx], self.var[idx], self.count[idx]
+            s_mean, s_var, s_count = self.s_mean[hour, idx], self.s_var[hour, idx], self.s_count[hour, idx]
+
+            # Score against the baselines as they were before this sample. The spread is floored
+            # at 1% of the mean and at the metric's minimum deviation.
+            min_dev = self.min_dev[idx]
+            floor = np.maximum(np.abs(mean) * 0.01, min_dev)
+            z = (x - mean) / np.maximum(np.sqrt(var), floor)
+            s_floor = np.maximum(np.abs(s_mean) * 0.01, min_dev)
+            s_z = (x - s_mean) / np.maximum(np.sqrt(s_var), s_floor)
+            seasonal_ready = s_count >= WARMUP
+            flagged = (count >= WARMUP) & (np.abs(z) > self.threshold) & (~seasonal_ready | (np.abs(s_z) > self.threshold))
+
+            # EWMA mean/variance update. Until 1/alpha samples are in, the weight is 1/(n+1),
+            # i.e. the exact running mean/variance (Welford), so the variance isn't biased low.
+            diff = x - mean
+            a = np.maximum(1.0 / (count + 1), ALPHA)
+            self.mean[idx] = mean + a * diff
+            self.var[idx] = (1 - a) * (var + a * diff * diff)
+            self.count[idx] = count + 1
+            s_diff = x - s_mean
+            sa = np.maximum(1.0 / (s_count + 1), SEASONAL_ALPHA)
+            self.s_mean[hour, idx] = s_mean + sa * s_diff
+            self.s_var[hour, idx] = (1 - sa) * (s_var + sa * s_diff * s_diff)
+            self.s_count[hour, idx] = s_count + 1
+
+            entering = flagged & ~self.active[idx]
+            self.active[idx] = flagged
+            for j in np.flatnonzero(entering):
+                i = idx[j]
+                expected = s_mean[j] if seasonal_ready[j] else mean[j]
+                self._emit(AnomalyEvent(
+                    timestamp=ts, metric=self.names[i], value=float(x[j]),
+                    expected=float(expected), score=float(z[j])
+                ))
+
+    def _emit(self, event: AnomalyEvent):
+        self.events.append(event)
+        per = self.by_metric.get(event.metric)
+        if per is None:
+            per = self.by_metric[event.metric] = deque(maxlen=PER_METRIC_CAPACITY)
+        per.append(event)
+
+    def recent(self, patterns: Optional[List[str]] = None, start: float = 0.0, end: float = float("inf"),
+               limit: Optional[int] = None) -> List[AnomalyEvent]:
+        with self._lock:
+            events = [e for e in self.events if start <= e.timestamp < end]
+        if patterns:
+            events = [e for e in events if any(fnmatch.fnmatchcase(e.metric, p) for p in patterns)]
+        return events[-limit:] if limit else events
+
+    def for_metric(self, name: str, start: float, end: float) -> List[AnomalyEvent]:
+        with self._lock:
+            return [e for e in self.by_metric.get(name, ()) if start <= e.timestamp < end]
+
+
+detector = AnomalyDetector()
+history.add_listener(detector.observe)
@@ -1,15 +1,35 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse, Response, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from typing import List, Optional
 from backend.models import (
     CPUInfo, MemoryInfo, DiskInfo, NetworkRate, ProcessInfo,
     SystemStaticInfo, SensorMetrics, DiskDetailed, NetworkDetailed,
-    NetConnection, ProcessDetail, ServiceInfo
+    NetConnection, ProcessDetail, ServiceInfo, SamplerStats, HistorySeries,
+    QuerySeries, AnomalyEvent, DebugStats, CgroupInfo,
+    BurstStatus, EventPage
 )
 from backend.metrics import collector
+from backend.sampler import sampler
+from backend.coalesce import singleflight
+from backend.history import history, parse_time, parse_duration, extract_metrics, RECORDED_GROUPS
+from backend.query import FUNCTIONS, run_query
+from backend.anomaly import detector
+from backend.burst import burst, MAX_SECONDS as BURST_MAX_SECONDS, MAX_HZ as BURST_MAX_HZ
+from backend.events import journal, PAGE_LIMIT as EVENTS_PAGE_LIMIT
+from backend.cgroups import cgroup_collector, SORT_KEYS as CGROUP_SORT_KEYS
+from backend.profiling import LatencyMiddleware, registry, stack_sampler, MAX_PROFILE_SECONDS
+from backend.wire import MEDIA_TYPE as WIRE_MEDIA_TYPE, FrameEncoder, encode_history_table, wants_binary
+from backend.export import STREAMERS, MEDIA_TYPES, available_formats
 from backend.security import get_api_key
 import os
+import json
+import asyncio
+import fnmatch
+import heapq
+import time
 
 app = FastAPI(
     title="VantaSys Monitor V6",
@@ -33,30 +53,39 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(LatencyMiddleware)
 
 auth_dep = Depends(get_api_key)
 
+def client_id(request: Request) -> str:
+    return request.client.host if request.client else "anonymous"
+
+async def shared(group: str, request: Request):
+    """Expensive groups: every caller counts as demand, but concurrent callers share one collection."""
+    sampler.touch(group, client_id(request))
+    return await singleflight.do(group, sampler.read, group)
+
 # --- V1 Compatible Endpoints ---
 
 @app.get("/api/cpu", response_model=CPUInfo, dependencies=[auth_dep], tags=["Core Metrics"])
-async def get_cpu():
-    return collector.get_cpu_info()
+async def get_cpu(request: Request):
+    return sampler.get("cpu", client_id(request))
 
 @app.get("/api/memory", response_model=MemoryInfo, dependencies=[auth_dep], tags=["Core Metrics"])
-async def get_memory():
-    return collector.get_memory_info()
+async def get_memory(request: Request):
+    return sampler.get("memory", client_id(request))
 
 @app.get("/api/disk", response_model=DiskInfo, dependencies=[auth_dep], tags=["Core Metrics"])
-async def get_disk():
-    return collector.get_disk_info()
+async def get_disk(request: Request):
+    return sampler.get("disk", client_id(request))
 
 @app.get("/api/network", response_model=NetworkRate, dependencies=[auth_dep], tags=["Core Metrics"])
-async def get_network():
-    return collector.get_network_info()
+async def get_network(request: Request):
+    return sampler.get("network", client_id(request)).global_rate
 
 @app.get("/api/processes", response_model=List[ProcessInfo], dependencies=[auth_dep], tags=["Processes"])
-async def get_processes(limit: int = 20):
-    return collector.get_top_processes(limit=limit)
+async def get_processes(request: Request, limit: int = 20):
+    return (await shared("processes", request))[:limit]
 
 @app.get("/api/process/{pid}", response_model=ProcessDetail, dependencies=[auth_dep], tags=["Processes"])
 async def get_process_detail(pid: int):
@@ -77,29 +106,266 @@ async def get_system_info():
     return collector.get_system_info()
 
 @app.get("/api/sensors", response_model=SensorMetrics, dependencies=[auth_dep], tags=["Hardware"])
-async def get_sensors():
-    return collector.get_sensors()
+async def get_sensors(request: Request):
+    return sampler.get("sensors", client_id(request))
 
 @app.get("/api/disk/detailed", response_model=DiskDetailed, dependencies=[auth_dep], tags=["Hardware"])
-async def get_disk_detailed():
-    return collector.get_disk_detailed()
+async def get_disk_detailed(request: Request):
+    return await shared("disk_detailed", request)
 
 @app.get("/api/network/detailed", response_model=NetworkDetailed, dependencies=[auth_dep], tags=["Hardware"])
-async def get_network_detailed():
-    return collector.get_network_detailed()
+async def get_network_detailed(request: Request):
+    return sampler.get("network", client_id(request))
 
 # --- V4 Deep Dive Endpoints ---
 
 @app.get("/api/network/connections", response_model=List[NetConnection], dependencies=[auth_dep], tags=["Deep Dive"])
-async def get_connections(limit: int = 100):
-    return collector.get_connections(limit=limit)
+async def get_connections(request: Request, limit: int = 100):
+    return (await shared("connections", request))[:limit]
 
 # --- V6 Omniscience Endpoints ---
 
 @app.get("/api/services", response_model=List[ServiceInfo], dependencies=[auth_dep], tags=["Omniscience"])
-async def get_services():
+async def get_services(request: Request):
     """Get all Windows Services."""
-    return collector.get_services()
+    return await shared("services", request)
+
+# --- V8 Adaptive Sampling Endpoints ---
+
+@app.get("/api/sampler", response_model=SamplerStats, dependencies=[auth_dep], tags=["Sampler"])
+async def get_sampler_stats():
+    """Effective rate, watchers and measured cost of every metric group, plus request coalescing counts."""
+    stats = sampler.stats()
+    stats.coalesce_calls, stats.coalesce_shared = singleflight.calls, singleflight.shared
+    return stats
+
+@app.get("/api/stream", dependencies=[auth_dep], tags=["Sampler"])
+async def stream(request: Request, groups: str = "cpu,memory,sensors", interval: Optional[float] = None,
+                 format: Optional[str] = None):
+    """
+    Feed of fresh samples; keeps the listed groups active while connected.
+    Server-Sent Events with full JSON models by default, or binary frames of the
+    numeric series (see backend/wire.py) with `format=bin` / `Accept: application/x-vantasys-columns`.
+    """
+    names = [g for g in groups.split(",") if g in sampler.groups]
+    if not names: raise HTTPException(status_code=400, detail="No valid metric groups")
+    binary = wants_binary(request.headers.get("accept"), format)
+    if binary and any(n not in RECORDED_GROUPS for n in names):
+        raise HTTPException(status_code=400, detail=f"Binary streams support {RECORDED_GROUPS}")
+    sub = sampler.subscribe(names, interval=interval, client=client_id(request))
+
+    async def frames():
+        seen = {name: 0 for name in names}
+        encoder = FrameEncoder()
+        try:
+            while not await request.is_disconnected():
+                for name in names:
+                    group = sampler.groups[name]
+                    if group.seq != seen[name] and group.value is not None:
+                        seen[name] = group.seq
+                        yield encoder.encode(name, group.last_sample, extract_metrics(name, group.value))
+                await asyncio.sleep(0.1)
+        finally:
+            sampler.unsubscribe(sub)
+
+    if binary:
+        return StreamingResponse(frames(), media_type=WIRE_MEDIA_TYPE, headers={"Cache-Control": "no-cache"})
+
+    async def events():
+        seen = {name: 0 for name in names}
+        try:
+            while not await request.is_disconnected():
+                for name in names:
+                    group = sampler.groups[name]
+                    if group.seq != seen[name] and group.value is not None:
+                        seen[name] = group.seq
+                        yield f"event: {name}\ndata: {json.dumps(jsonable_encoder(group.value))}\n\n"
+                await asyncio.sleep(0.1)
+        finally:
+            sampler.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+# --- V8 History Endpoints ---
+
+def metric_patterns(metrics: Optional[str]) -> List[str]:
+    return [m.strip() for m in (metrics or "").split(",") if m.strip()]
+
+@app.get("/api/history/metrics", response_model=List[str], dependencies=[auth_dep], tags=["History"])
+async def get_history_metrics(metrics: Optional[str] = None):
+    """Names of recorded series, optionally filtered by comma-separated glob patterns."""
+    return history.names(metric_patterns(metrics))
+
+@app.get("/api/history", response_model=List[HistorySeries], dependencies=[auth_dep], tags=["History"])
+def get_history(request: Request, metrics: str, start: Optional[str] = Query(None, alias="from"),
+                end: Optional[str] = Query(None, alias="to"), resolution: str = "auto", format: Optional[str] = None):
+    """
+    Stored points for the matching series. `from`/`to` take epoch seconds, ISO-8601 or '-6h'.
+    `format=bin` / `Accept: application/x-vantasys-columns` returns packed float32 tables instead of JSON.
+    """
+    now = time.time()
+    try:
+        t_end = parse_time(end, now, now)
+        t_start = parse_time(start, t_end - 3600, now)
+    except ValueError: raise HTTPException(status_code=400, detail="Invalid time range")
+    names = history.names(metric_patterns(metrics))
+    if wants_binary(request.headers.get("accept"), format):
+        body = b"".join(encode_history_table(name, *history.range(name, t_start, t_end, resolution)) for name in names)
+        return Response(content=body, media_type=WIRE_MEDIA_TYPE)
+    out = []
+    for name in names:
+        ts, val = history.range(name, t_start, t_end, resolution)
+        out.append(HistorySeries(
+            metric=name, timestamps=ts.tolist(), values=[None if v != v else v for v in val.tolist()],
+            anomalies=detector.for_metric(name, t_start, t_end)
+        ))
+    return out
+
+@app.get("/api/export", dependencies=[auth_dep], tags=["History"])
+def export_history(metrics: Optional[str] = None, start: Optional[str] = Query(None, alias="from"),
+                   end: Optional[str] = Query(None, alias="to"), format: str = "csv", resolution: str = "auto"):
+    """Stream stored history as long-format rows (timestamp, metric, value) without buffering the range."""
+    if format not in available_formats():
+        raise HTTPException(status_code=400, detail=f"Unsupported format, expected one of {available_formats()}")
+    now = time.time()
+    try:
+        t_end = parse_time(end, now, now)
+        t_start = parse_time(start, t_end - 86400, now)
+    except ValueError: raise HTTPException(status_code=400, detail="Invalid time range")
+    names = history.names(metric_patterns(metrics))
+    filename = f"vantasys-{int(t_start)}-{int(t_end)}.{format}"
+    return StreamingResponse(
+        STREAMERS[format](history, names, t_start, t_end, resolution),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/query", response_model=List[QuerySeries], dependencies=[auth_dep], tags=["History"])
+def query_history(fn: str, metrics: str, range: Optional[str] = None, start: Optional[str] = Query(None, alias="from"),
+                  end: Optional[str] = Query(None, alias="to"), step: Optional[str] = None, q: float = 0.5,
+                  topk: Optional[int] = Query(None, gt=0), resolution: str = "auto"):
+    """
+    Aggregate stored series, e.g. `fn=quantile_over_time&q=0.95&metrics=cpu.usage_percent&range=6h`
+    or `fn=rate&metrics=net.*.bytes_recv&step=1m&from=-1d&topk=5`.
+    """
+    if fn not in FUNCTIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown function, expected one of {sorted(FUNCTIONS)}")
+    if not 0.0 <= q <= 1.0: raise HTTPException(status_code=400, detail="q must be within [0, 1]")
+    now = time.time()
+    try:
+        t_end = parse_time(end, now, now)
+        t_start = t_end - parse_duration(range) if range else parse_time(start, t_end - 3600, now)
+        t_step = parse_duration(step) if step else None
+    except ValueError: raise HTTPException(status_code=400, detail="Invalid time range")
+    if t_step is not None and t_step <= 0: raise HTTPException(status_code=400, detail="step must be positive")
+    return run_query(history, fn, history.names(metric_patterns(metrics)), t_start, t_end, t_step, q, topk, resolution)
+
+@app.get("/api/anomalies", response_model=List[AnomalyEvent], dependencies=[auth_dep], tags=["History"])
+async def get_anomalies(metrics: Optional[str] = None, start: Optional[str] = Query(None, alias="from"),
+                        end: Optional[str] = Query(None, alias="to"), limit: int = 100):
+    """Recent samples that broke away from their streaming baseline, oldest first."""
+    now = time.time()
+    try:
+        t_end = parse_time(end, float("inf"), now)
+        t_start = parse_time(start, 0.0, now)
+    except ValueError: raise HTTPException(status_code=400, detail="Invalid time range")
+    return detector.recent(metric_patterns(metrics), t_start, t_end, limit)
+
+# --- V8 Cgroup Endpoints ---
+
+@app.get("/api/cgroups", response_model=List[CgroupInfo], dependencies=[auth_dep], tags=["Cgroups"])
+async def get_cgroups(request: Request, sort: str = "cpu", limit: int = 20, include_empty: bool = False):
+    """Top-K cgroups (v2) by `sort`; cgroups without processes are skipped unless `include_empty` is set."""
+    key = CGROUP_SORT_KEYS.get(sort)
+    if key is None:
+        raise HTTPException(status_code=400, detail=f"Unknown sort key, expected one of {', '.join(CGROUP_SORT_KEYS)}")
+    if not cgroup_collector.available:
+        raise HTTPException(status_code=404, detail="cgroup v2 hierarchy not available")
+    groups = await shared("cgroups", request)
+    if not include_empty: groups = [g for g in groups if g.populated]
+    return heapq.nlargest(limit, groups, key=key)
+
+# --- V8 Burst Capture Endpoints ---
+
+@app.post("/api/burst", response_model=BurstStatus, dependencies=[auth_dep], tags=["Burst"])
+async def start_burst(seconds: float = Query(5.0, gt=0, le=BURST_MAX_SECONDS), hz: float = Query(50.0, gt=0, le=BURST_MAX_HZ)):
+    """Start a high-frequency capture of per-core CPU, run queue, disk and NIC counters."""
+    if not burst.available:
+        raise HTTPException(status_code=404, detail="Burst capture needs /proc")
+    capture = burst.start(seconds, hz)
+    if capture is None:
+        raise HTTPException(status_code=409, detail="A capture is already running")
+    return capture.status()
+
+@app.get("/api/burst", response_model=List[BurstStatus], dependencies=[auth_dep], tags=["Burst"])
+async def list_bursts():
+    """Running and retained captures, newest first, with their measured sampling overhead."""
+    return burst.list()
+
+@app.get("/api/burst/{capture_id}", response_model=List[HistorySeries], dependencies=[auth_dep], tags=["Burst"])
+def get_burst(request: Request, capture_id: int, metrics: Optional[str] = None, format: Optional[str] = None):
+    """Derived rates of a finished capture; same JSON and binary layouts as /api/history."""
+    capture = burst.get(capture_id)
+    if capture is None:
+        raise HTTPException(status_code=404, detail="Capture not found")
+    if capture.state == "running":
+        raise HTTPException(status_code=409, detail="Capture still running")
+    if capture.state == "failed":
+        raise HTTPException(status_code=409, detail=f"Capture failed: {capture.error}")
+    series = capture.series()
+    patterns = metric_patterns(metrics)
+    names = sorted(n for n in series if not patterns or any(fnmatch.fnmatchcase(n, p) for p in patterns))
+    if wants_binary(request.headers.get("accept"), format):
+        return Response(content=b"".join(encode_history_table(n, *series[n]) for n in names), media_type=WIRE_MEDIA_TYPE)
+    return [
+        HistorySeries(metric=n, timestamps=series[n][0].tolist(), values=[None if v != v else v for v in series[n][1].tolist()])
+        for n in names
+    ]
+
+# --- V8 Event Journal Endpoints ---
+
+@app.get("/api/events", response_model=EventPage, dependencies=[auth_dep], tags=["Events"])
+async def get_events(after: int = 0, limit: int = Query(EVENTS_PAGE_LIMIT, gt=0, le=EVENTS_PAGE_LIMIT)):
+    """Journal entries after `after`; pass the returned `next_cursor` back to tail the journal."""
+    return journal.after(after, limit)
+
+@app.get("/api/events/stream", dependencies=[auth_dep], tags=["Events"])
+async def stream_events(request: Request, after: Optional[int] = None):
+    """
+    Server-Sent Events feed of new journal entries, each with its cursor as the event id.
+    Starts after `after` (or the Last-Event-ID header on reconnect), otherwise at the newest entry.
+    """
+    if after is None:
+        last_id = request.headers.get("last-event-id")
+        after = int(last_id) if last_id and last_id.isdigit() else journal.last_cursor
+
+    async def events():
+        cursor = after
+        while not await request.is_disconnected():
+            if journal.last_cursor != cursor:
+                page = journal.after(cursor)
+                for event in page.events:
+                    yield f"id: {event.cursor}\nevent: {event.kind}\ndata: {event.model_dump_json()}\n\n"
+                cursor = page.next_cursor
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+# --- V8 Self Profiling Endpoints ---
+
+@app.get("/debug/stats", response_model=DebugStats, dependencies=[auth_dep], tags=["Debug"])
+async def get_debug_stats():
+    """Per-route latency/payload histograms and per-collector-method latency."""
+    return registry.stats()
+
+@app.get("/debug/profile", response_class=PlainTextResponse, dependencies=[auth_dep], tags=["Debug"])
+def get_debug_profile(seconds: float = 5.0, hz: float = 100.0):
+    """Sample every thread's stack for `seconds` and return collapsed stacks for flamegraph tools."""
+    if not 0 < seconds <= MAX_PROFILE_SECONDS: raise HTTPException(status_code=400, detail=f"seconds must be in (0, {MAX_PROFILE_SECONDS}]")
+    if not 1 <= hz <= 1000: raise HTTPException(status_code=400, detail="hz must be in [1, 1000]")
+    stacks = stack_sampler.profile(seconds, hz)
+    if stacks is None: raise HTTPException(status_code=409, detail="A profile is already running")
+    return stacks
 
 # Static Files
 frontend_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend")
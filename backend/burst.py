@@ -0,0 +1,304 @@
+import fnmatch
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from backend.history import history
+from backend.models import BurstStatus
+
+MAX_HZ = 100.0
+MIN_HZ = 1.0
+MAX_SECONDS = 60.0
+# Finished captures kept for download, oldest dropped first.
+KEEP_CAPTURES = 5
+# Alert rules ("metric>value", comma separated, metric may be a glob) that start a capture.
+RULES = os.getenv("VANTASYS_BURST_RULES", "")
+RULE_SECONDS = float(os.getenv("VANTASYS_BURST_SECONDS", "5"))
+RULE_HZ = float(os.getenv("VANTASYS_BURST_HZ", "50"))
+# Minimum time between two rule-triggered captures.
+RULE_COOLDOWN = 300.0
+
+PROC_ROOT = "/proc"
+SYS_BLOCK = "/sys/block"
+CPU_FIELDS = ["user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal"]
+# Derived per-core percentages (shares of the core's jiffies in each interval)
+CPU_PERCENTS = ["user", "system", "iowait", "irq", "softirq", "steal"]
+SECTOR_BYTES = 512
+
+_RULE = re.compile(r"^\s*([^<>]+?)\s*([<>])\s*(-?[\d.]+)\s*$")
+
+
+class _Source:
+    """One /proc file kept open and re-read with pread; `parse` maps its text to {key: [counters]}."""
+
+    def __init__(self, path: str, parse: Callable[[str], Dict[str, List[int]]]):
+        self.fd = os.open(path, os.O_RDONLY)
+        self.parse = parse
+
+    def read(self) -> Dict[str, List[int]]:
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(self.fd, 65536, offset)
+            if not chunk: break
+            chunks.append(chunk)
+            offset += len(chunk)
+        return self.parse(b"".join(chunks).decode())
+
+    def close(self):
+        try: os.close(self.fd)
+        except OSError: pass
+
+
+def _open_source(path: str, parse: Callable[[str], Dict[str, List[int]]]) -> Tuple[_Source, Dict[str, List[int]]]:
+    """Open a source and take its first reading; the descriptor is closed if that fails."""
+    source = _Source(path, parse)
+    try: return source, source.read()
+    except:
+        source.close()
+        raise
+
+
+def _parse_stat(text: str) -> Dict[str, List[int]]:
+    out = {}
+    for line in text.splitlines():
+        if line.startswith("cpu") and line[3:4].isdigit():
+            parts = line.split()
+            out[parts[0]] = [int(v) for v in parts[1:9]]
+        elif line.startswith("procs_"):
+            key, value = line.split()
+            out[key] = [int(value)]
+    return out
+
+
+def _parse_diskstats(text: str) -> Dict[str, List[int]]:
+    out = {}
+    for line in text.splitlines():
+        parts = line.split()
+        # sectors read, sectors written, ms spent doing I/O
+        if len(parts) >= 13: out[parts[2]] = [int(parts[5]), int(parts[9]), int(parts[12])]
+    return out
+
+
+def _parse_netdev(text: str) -> Dict[str, List[int]]:
+    out = {}
+    for line in text.splitlines()[2:]:
+        name, _, rest = line.partition(":")
+        parts = rest.split()
+        if len(parts) >= 9: out[name.strip()] = [int(parts[0]), int(parts[8])]
+    return out
+
+
+class Capture:
+    """A preallocated counter buffer plus what is needed to turn it into rates afterwards."""
+
+    def __init__(self, capture_id: int, trigger: str, seconds: float, hz: float):
+        self.id = capture_id
+        self.trigger = trigger
+        self.seconds = seconds
+        self.hz = hz
+        self.state = "running"
+        self.started = time.time()
+        self.samples = 0
+        self.cpu_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.sample_max = 0.0
+        self.missed = 0
+        self.max_lag = 0.0
+        self.error: Optional[str] = None
+        self.sources: List[Tuple[_Source, List[Tuple[str, int]]]] = []
+        self.cpus: List[str] = []
+        self.disks: List[str] = []
+        self.nics: List[str] = []
+        self.width = 0
+        self.ts: Optional[np.ndarray] = None
+        self.buf: Optional[np.ndarray] = None
+        self._series: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None
+
+    def status(self) -> BurstStatus:
+        return BurstStatus(
+            id=self.id, trigger=self.trigger, state=self.state, error=self.error, started=self.started,
+            seconds=self.seconds, hz=self.hz, samples=self.samples, columns=self.width,
+            buffer_bytes=(self.buf.nbytes + self.ts.nbytes) if self.buf is not None else 0,
+            achieved_hz=(self.samples - 1) / self.wall_seconds if self.samples > 1 and self.wall_seconds else 0.0,
+            overhead_percent=self.cpu_seconds / self.wall_seconds * 100.0 if self.wall_seconds else 0.0,
+            sample_mean_us=self.cpu_seconds / self.samples * 1e6 if self.samples else 0.0,
+            sample_max_us=self.sample_max * 1e6, missed=self.missed, max_lag_ms=self.max_lag * 1000.0
+        )
+
+    def series(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Rates per interval (timestamped at the interval's end), computed once after the capture."""
+        if self._series is not None: return self._series
+        if self.ts is None: return {}  # failed before the buffer was allocated
+        # Rows of skipped slots were never written (NaN timestamp); rates span the gap instead
+        filled = ~np.isnan(self.ts)
+        stamps, raw = self.ts[filled], self.buf[filled]
+        out: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        if len(stamps) < 2:
+            self._series = out
+            return out
+        ts = stamps[1:]
+        dt = np.diff(stamps)
+        dt[dt <= 0] = np.nan
+        delta = np.diff(raw, axis=0).astype(np.float64)
+        col = 0
+        nf = len(CPU_FIELDS)
+        for cpu in self.cpus:
+            d = delta[:, col:col + nf]
+            total = d.sum(axis=1)
+            total[total <= 0] = np.nan
+            busy = total - d[:, CPU_FIELDS.index("idle")] - d[:, CPU_FIELDS.index("iowait")]
+            out[f"cpu.core.{cpu[3:]}.usage_percent"] = (ts, busy / total * 100.0)
+            for field in CPU_PERCENTS:
+                out[f"cpu.core.{cpu[3:]}.{field}_percent"] = (ts, d[:, CPU_FIELDS.index(field)] / total * 100.0)
+            col += nf
+        for key in ("procs_running", "procs_blocked"):
+            out[f"sched.{key}"] = (ts, raw[1:, col].astype(np.float64))
+            col += 1
+        for disk in self.disks:
+            out[f"disk.{disk}.read_speed"] = (ts, delta[:, col] * SECTOR_BYTES / dt)
+            out[f"disk.{disk}.write_speed"] = (ts, delta[:, col + 1] * SECTOR_BYTES / dt)
+            out[f"disk.{disk}.busy_percent"] = (ts, np.minimum(delta[:, col + 2] / 1000.0 / dt * 100.0, 100.0))
+            col += 3
+        for nic in self.nics:
+            out[f"net.{nic}.recv_speed"] = (ts, delta[:, col] / dt)
+            out[f"net.{nic}.send_speed"] = (ts, delta[:, col + 1] / dt)
+            col += 2
+        self._series = {name: (t, v.astype(np.float32)) for name, (t, v) in out.items()}
+        return self._series
+
+
+class BurstRecorder:
+    """
+    High-frequency capture of CPU per core, run queue, disk and NIC counters.
+
+    A capture reads /proc/stat, /proc/diskstats and /proc/net/dev with pread on
+    descriptors opened up front and copies the raw counters into a buffer sized for
+    the whole window before sampling starts, so the sampling loop does no allocation
+    beyond parsing. Rates are derived only when the capture is downloaded. The loop
+    measures its own CPU time, per-sample cost and schedule lag.
+    """
+
+    def __init__(self, proc_root: str = PROC_ROOT):
+        self.proc_root = proc_root
+        self.available = os.path.exists(os.path.join(proc_root, "stat"))
+        self.captures: "OrderedDict[int, Capture]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._running: Optional[Capture] = None
+        self._rules = self._parse_rules(RULES)
+        self._last_rule_start = 0.0
+
+    @staticmethod
+    def _parse_rules(spec: str) -> List[Tuple[str, str, float]]:
+        rules = []
+        for part in spec.split(","):
+            m = _RULE.match(part)
+            if m: rules.append((m.group(1), m.group(2), float(m.group(3))))
+        return rules
+
+    def start(self, seconds: float, hz: float, trigger: str = "api") -> Optional[Capture]:
+        """Begin a capture in the background; None if one is already running."""
+        seconds = min(max(seconds, 0.1), MAX_SECONDS)
+        hz = min(max(hz, MIN_HZ), MAX_HZ)
+        with self._lock:
+            if self._running is not None: return None
+            capture = Capture(self._next_id, trigger, seconds, hz)
+            self._next_id += 1
+            self._running = capture
+            self.captures[capture.id] = capture
+            while len(self.captures) > KEEP_CAPTURES:
+                self.captures.popitem(last=False)
+        threading.Thread(target=self._run, args=(capture,), name="vantasys-burst", daemon=True).start()
+        return capture
+
+    def get(self, capture_id: int) -> Optional[Capture]:
+        return self.captures.get(capture_id)
+
+    def list(self) -> List[BurstStatus]:
+        return [c.status() for c in reversed(self.captures.values())]
+
+    def _prepare(self, capture: Capture):
+        stat, first = _open_source(os.path.join(self.proc_root, "stat"), _parse_stat)
+        capture.cpus = sorted((k for k in first if k.startswith("cpu")), key=lambda k: int(k[3:]))
+        layout = [(cpu, len(CPU_FIELDS)) for cpu in capture.cpus] + [("procs_running", 1), ("procs_blocked", 1)]
+        capture.sources.append((stat, layout))
+        try:
+            whole = set(os.listdir(SYS_BLOCK)) if os.path.isdir(SYS_BLOCK) else None
+            disks, parsed = _open_source(os.path.join(self.proc_root, "diskstats"), _parse_diskstats)
+            capture.disks = sorted(d for d in parsed if (whole is None or d in whole) and not d.startswith(("loop", "ram")))
+            capture.sources.append((disks, [(d, 3) for d in capture.disks]))
+        except OSError: pass
+        try:
+            nics, parsed = _open_source(os.path.join(self.proc_root, "net", "dev"), _parse_netdev)
+            capture.nics = sorted(n for n in parsed if n != "lo")
+            capture.sources.append((nics, [(n, 2) for n in capture.nics]))
+        except OSError: pass
+        capture.width = sum(w for _, layout in capture.sources for _, w in layout)
+        rows = int(capture.seconds * capture.hz) + 1
+        capture.ts = np.full(rows, np.nan, dtype=np.float64)
+        capture.buf = np.zeros((rows, capture.width), dtype=np.int64)
+
+    def _run(self, capture: Capture):
+        try:
+            self._prepare(capture)
+            sources = capture.sources
+            ts, buf = capture.ts, capture.buf
+            rows = len(ts)
+            interval = 1.0 / capture.hz
+            offset = time.time() - time.perf_counter()
+            cpu_start = time.thread_time()
+            start = time.perf_counter()
+            # Row i belongs to slot i (start + i / hz); an overrun skips slots, leaving
+            # their rows empty, so the capture never runs past its window.
+            slot = 0
+            while slot < rows:
+                at = start + slot * interval
+                now = time.perf_counter()
+                if now < at:
+                    time.sleep(at - now)
+                    now = time.perf_counter()
+                lag = now - at
+                if lag > capture.max_lag: capture.max_lag = lag
+                row: List[int] = []
+                for source, layout in sources:
+                    parsed = source.read()
+                    for key, width in layout:
+                        row.extend(parsed.get(key) or [0] * width)
+                ts[slot] = now + offset
+                buf[slot] = row
+                capture.samples += 1
+                done = time.perf_counter()
+                if done - now > capture.sample_max: capture.sample_max = done - now
+                following = int((done - start) / interval) + 1
+                capture.missed += following - slot - 1
+                slot = following
+            capture.wall_seconds = time.perf_counter() - start
+            capture.cpu_seconds = time.thread_time() - cpu_start
+            capture.state = "done"
+        except Exception as e:
+            capture.state = "failed"
+            capture.error = str(e)
+        finally:
+            for source, _ in capture.sources: source.close()
+            with self._lock: self._running = None
+
+    def check_rules(self, ts: float, metrics: Dict[str, float]):
+        """History listener: start a capture when a rule matches, at most once per cooldown."""
+        if not self._rules or self._running is not None or ts - self._last_rule_start < RULE_COOLDOWN: return
+        for pattern, op, limit in self._rules:
+            names = [pattern] if pattern in metrics else [n for n in metrics if fnmatch.fnmatchcase(n, pattern)]
+            for name in names:
+                value = metrics[name]
+                if value is None or value != value: continue
+                if (value > limit) if op == ">" else (value < limit):
+                    if self.start(RULE_SECONDS, RULE_HZ, trigger=f"{name}{op}{limit:g}") is not None:
+                        self._last_rule_start = ts
+                    return
+
+
+burst = BurstRecorder()
+history.add_listener(burst.check_rules)
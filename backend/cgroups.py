@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from backend.models import CgroupInfo, ProcessInfo
+from backend.procfs import read_text, read_int, parse_flat_keyed, parse_pressure
+from backend.profiling import timed
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+# Full directory walks are repeated this often; between walks only known cgroups are read.
+RESCAN_SECONDS = 30.0
+# Processes listed per cgroup in the response.
+PIDS_PER_CGROUP = 10
+
+SORT_KEYS = {
+    "cpu": lambda c: c.cpu_percent,
+    "throttled": lambda c: c.throttled_percent,
+    "memory": lambda c: c.memory_current or 0,
+    "memory_peak": lambda c: c.memory_peak or 0,
+    "io": lambda c: c.io_read_speed + c.io_write_speed,
+    "pressure_cpu": lambda c: c.pressure_cpu or 0.0,
+    "pressure_memory": lambda c: c.pressure_memory or 0.0,
+    "pressure_io": lambda c: c.pressure_io or 0.0,
+    "processes": lambda c: c.processes,
+}
+
+
+class _Counters:
+    __slots__ = ("ts", "usage_usec", "throttled_usec", "rbytes", "wbytes")
+
+    def __init__(self, ts: float, usage_usec: int, throttled_usec: int, rbytes: int, wbytes: int):
+        self.ts = ts
+        self.usage_usec = usage_usec
+        self.throttled_usec = throttled_usec
+        self.rbytes = rbytes
+        self.wbytes = wbytes
+
+
+class CgroupCollector:
+    """
+    Per-cgroup resource accounting for the cgroup v2 hierarchy.
+
+    The tree (and memory.max) is walked once and then only every RESCAN_SECONDS, or
+    when a known cgroup disappears; each sample reads just the stat files of populated cgroups.
+    Rates come from deltas against the previous sample. Processes are mapped to
+    their cgroup through /proc/<pid>/cgroup, cached per (pid, create_time) so only
+    new processes cost a read.
+    """
+
+    def __init__(self, root: str = CGROUP_ROOT, proc_root: str = "/proc"):
+        # Hybrid hosts mount the v2 hierarchy under unified/ next to the v1 controllers
+        if not os.path.exists(os.path.join(root, "cgroup.controllers")) and os.path.exists(os.path.join(root, "unified", "cgroup.controllers")):
+            root = os.path.join(root, "unified")
+        self.root = root
+        self.proc_root = proc_root
+        self.available = os.path.exists(os.path.join(root, "cgroup.controllers"))
+        self._lock = threading.Lock()
+        self._paths: List[str] = []
+        self._next_walk = 0.0
+        self._prev: Dict[str, _Counters] = {}
+        self._pid_cgroup: Dict[Tuple[int, float], str] = {}
+        # Limits rarely change, so they are only re-read on a walk
+        self._memory_max: Dict[str, Optional[int]] = {}
+
+    def _walk(self):
+        paths = []
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            try:
+                with os.scandir(self.root + rel) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            child = f"{rel}/{entry.name}"
+                            paths.append(child)
+                            stack.append(child)
+            except OSError:
+                continue
+        self._paths = sorted(paths)
+        self._memory_max = {rel: read_int(self.root + rel + "/memory.max") for rel in self._paths}
+        for rel in [r for r in self._prev if r not in self._memory_max]: del self._prev[rel]
+        self._next_walk = time.monotonic() + RESCAN_SECONDS
+
+    def _read(self, rel: str, now: float) -> Optional[CgroupInfo]:
+        base = self.root + rel
+        events = parse_flat_keyed(read_text(base + "/cgroup.events"))
+        if not events and not os.path.isdir(base): return None
+        if events.get("populated") == 0:
+            self._prev.pop(rel, None)
+            return CgroupInfo(path=rel, populated=False)
+
+        cpu = parse_flat_keyed(read_text(base + "/cpu.stat"))
+        rbytes = wbytes = 0
+        for line in (read_text(base + "/io.stat") or "").splitlines():
+            for field in line.split()[1:]:
+                key, _, value = field.partition("=")
+                if key == "rbytes": rbytes += int(value)
+                elif key == "wbytes": wbytes += int(value)
+        counters = _Counters(now, cpu.get("usage_usec", 0), cpu.get("throttled_usec", 0), rbytes, wbytes)
+
+        info = CgroupInfo(
+            path=rel, populated=True,
+            cpu_usage_usec=counters.usage_usec, nr_throttled=cpu.get("nr_throttled", 0),
+            throttled_usec=counters.throttled_usec,
+            memory_current=read_int(base + "/memory.current"), memory_peak=read_int(base + "/memory.peak"),
+            memory_max=self._memory_max.get(rel),
+            io_read_bytes=rbytes, io_write_bytes=wbytes,
+            pressure_cpu=parse_pressure(read_text(base + "/cpu.pressure")).get("some_avg10"),
+            pressure_memory=parse_pressure(read_text(base + "/memory.pressure")).get("some_avg10"),
+            pressure_io=parse_pressure(read_text(base + "/io.pressure")).get("some_avg10"),
+        )
+        prev = self._prev.get(rel)
+        if prev is not None and now > prev.ts:
+            dt = now - prev.ts
+            info.cpu_percent = max(0.0, (counters.usage_usec - prev.usage_usec) / 1e6 / dt * 100.0)
+            info.throttled_percent = max(0.0, (counters.throttled_usec - prev.throttled_usec) / 1e6 / dt * 100.0)
+            info.io_read_speed = max(0.0, (rbytes - prev.rbytes) / dt)
+            info.io_write_speed = max(0.0, (wbytes - prev.wbytes) / dt)
+        self._prev[rel] = counters
+        return info
+
+    def _cgroup_of(self, pid: int) -> Optional[str]:
+        for line in (read_text(f"{self.proc_root}/{pid}/cgroup") or "").splitlines():
+            if line.startswith("0::"): return line[3:].strip()
+        return None
+
+    def _map_processes(self, procs: List[ProcessInfo]) -> Dict[str, List[ProcessInfo]]:
+        by_cgroup: Dict[str, List[ProcessInfo]] = {}
+        alive: Set[Tuple[int, float]] = set()
+        for p in procs:
+            key = (p.pid, p.create_time)
+            alive.add(key)
+            path = self._pid_cgroup.get(key)
+            if path is None:
+                path = self._cgroup_of(p.pid)
+                if path is None: continue
+                self._pid_cgroup[key] = path
+            by_cgroup.setdefault(path, []).append(p)
+        for key in [k for k in self._pid_cgroup if k not in alive]:
+            del self._pid_cgroup[key]
+        return by_cgroup
+
+    @timed("cgroups.collect")
+    def collect(self, procs: Optional[List[ProcessInfo]] = None) -> List[CgroupInfo]:
+        """Every known cgroup with fresh counters; `procs` (the process table) attaches processes."""
+        if not self.available: return []
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_walk: self._walk()
+            results = []
+            vanished = False
+            for rel in self._paths:
+                info = self._read(rel, now)
+                if info is None:
+                    vanished = True
+                    self._prev.pop(rel, None)
+                    continue
+                results.append(info)
+            if vanished: self._next_walk = 0.0
+            if procs:
+                members = self._map_processes(procs)
+                for info in results:
+                    group = members.get(info.path, [])
+                    info.processes = len(group)
+                    info.pids = [p.pid for p in sorted(group, key=lambda p: p.cpu_percent, reverse=True)[:PIDS_PER_CGROUP]]
+            return results
+
+
+cgroup_collector = CgroupCollector()
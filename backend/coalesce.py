@@ -0,0 +1,54 @@
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, Tuple
+from starlette.concurrency import run_in_threadpool
+
+# Results younger than this are shared with later callers instead of recomputed.
+COALESCE_TTL = float(os.getenv("VANTASYS_COALESCE_TTL", "1.0"))
+
+
+class Singleflight:
+    """
+    Coalesces concurrent calls for the same key into one computation.
+
+    The first caller starts a task running `fn` in the threadpool (off the event
+    loop); callers arriving while it is in flight await the same task, and callers
+    arriving within `ttl` seconds after it finished get the cached result.
+    """
+
+    def __init__(self, ttl: float = COALESCE_TTL):
+        self.ttl = ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._results: Dict[str, Tuple[float, Any]] = {}
+        # Reported by /api/sampler: shared / calls is the coalescing hit rate
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[..., Any], *args) -> Any:
+        self.calls += 1
+        cached = self._results.get(key)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            self.shared += 1
+            return cached[1]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.shared += 1
+        else:
+            # The flight is its own task, so a cancelled caller (leader or not) can't orphan the rest
+            pending = self._inflight[key] = asyncio.ensure_future(self._fly(key, fn, *args))
+            # Nobody may be waiting on a failed flight; don't warn about an unretrieved exception
+            pending.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return await asyncio.shield(pending)
+
+    async def _fly(self, key: str, fn: Callable[..., Any], *args) -> Any:
+        try:
+            value = await run_in_threadpool(fn, *args)
+        finally:
+            del self._inflight[key]
+        self._results[key] = (time.monotonic(), value)
+        return value
+
+
+singleflight = Singleflight()
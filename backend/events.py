@@ -0,0 +1,157 @@
+import itertools
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from backend.models import (
+    SystemEvent, EventPage, ProcessInfo, NetworkDetailed, DiskDetailed, NetConnection, SensorMetrics
+)
+from backend.sampler import sampler
+
+JOURNAL_CAPACITY = int(os.getenv("VANTASYS_EVENTS_CAPACITY", "10000"))
+# Background sampling period of the watched groups; 0 only records events while clients poll them.
+EVENTS_INTERVAL = float(os.getenv("VANTASYS_EVENTS_INTERVAL", "5"))
+WATCHED_GROUPS = ["processes", "network", "disk_detailed", "connections", "sensors"]
+# Cap per diff, so a fork bomb or mass exit can't flush the whole journal in one sample.
+MAX_EVENTS_PER_DIFF = 200
+PAGE_LIMIT = 1000
+
+
+class Journal:
+    """Bounded append-only event log; cursors increase by one per event and are never reused."""
+
+    def __init__(self, capacity: int = JOURNAL_CAPACITY):
+        self.events: Deque[SystemEvent] = deque(maxlen=capacity)
+        self._cursors = itertools.count(1)
+        self._lock = threading.Lock()
+        self.last_cursor = 0
+
+    def append(self, ts: float, kind: str, subject: str, message: str, severity: str = "info"):
+        with self._lock:
+            cursor = next(self._cursors)
+            self.events.append(SystemEvent(
+                cursor=cursor, timestamp=ts, kind=kind, subject=subject, message=message, severity=severity
+            ))
+            self.last_cursor = cursor
+
+    def after(self, cursor: int, limit: int = PAGE_LIMIT) -> EventPage:
+        """
+        Events with a cursor greater than `cursor`. `gap` is set when some were already
+        evicted, or when the cursor is from a previous server run (then paging restarts).
+        """
+        with self._lock:
+            reset = cursor > self.last_cursor
+            if reset: cursor = 0
+            first = self.events[0].cursor if self.events else self.last_cursor + 1
+            skip = max(cursor - first + 1, 0)
+            page = list(itertools.islice(self.events, skip, skip + limit))
+        return EventPage(events=page, next_cursor=page[-1].cursor if page else cursor,
+                         gap=reset or cursor + 1 < first)
+
+
+class SnapshotDiffer:
+    """
+    Turns consecutive samples of the watched groups into journal events.
+
+    Every group keeps only a keyed index of its previous snapshot (a dict or set), so
+    a diff is two set differences plus lookups, linear in the table size. The first
+    sample of a group only sets the baseline.
+    """
+
+    def __init__(self, journal: Journal):
+        self.journal = journal
+        self._lock = threading.Lock()
+        self._procs: Optional[Dict[Tuple[int, float], str]] = None
+        self._ifaces: Optional[Dict[str, Tuple[bool, int]]] = None
+        self._mounts: Optional[Dict[Tuple[str, str], str]] = None
+        self._listeners: Optional[Dict[Tuple[str, str, str], str]] = None
+        self._sensor_levels: Dict[Tuple[str, str], int] = {}
+        self._handlers = {
+            "processes": self._diff_processes, "network": self._diff_interfaces,
+            "disk_detailed": self._diff_mounts, "connections": self._diff_listeners,
+            "sensors": self._diff_sensors,
+        }
+
+    def on_sample(self, group: str, ts: float, value: Any):
+        handler = self._handlers.get(group)
+        if handler is None or value is None: return
+        with self._lock:
+            try: handler(ts, value)
+            except: pass
+
+    def _emit_changes(self, ts: float, kind: str, keys, describe):
+        for key in itertools.islice(sorted(keys, key=str), MAX_EVENTS_PER_DIFF):
+            self.journal.append(ts, kind, *describe(key))
+        if len(keys) > MAX_EVENTS_PER_DIFF:
+            self.journal.append(ts, kind, "*", f"{len(keys) - MAX_EVENTS_PER_DIFF} more {kind} events suppressed", "warning")
+
+    def _diff_processes(self, ts: float, procs: List[ProcessInfo]):
+        current = {(p.pid, p.create_time): p.name for p in procs}
+        prev, self._procs = self._procs, current
+        if prev is None: return
+        started = current.keys() - prev.keys()
+        exited = prev.keys() - current.keys()
+        self._emit_changes(ts, "process.start", started, lambda k: (f"pid {k[0]}", f"{current[k]} started (PID {k[0]})"))
+        self._emit_changes(ts, "process.exit", exited, lambda k: (f"pid {k[0]}", f"{prev[k]} exited (PID {k[0]})"))
+
+    def _diff_interfaces(self, ts: float, net: NetworkDetailed):
+        current = {i.name: (i.is_up, i.speed) for i in net.interfaces}
+        prev, self._ifaces = self._ifaces, current
+        if prev is None: return
+        for name in current.keys() - prev.keys():
+            self.journal.append(ts, "interface.added", name, f"Interface {name} appeared")
+        for name in prev.keys() - current.keys():
+            self.journal.append(ts, "interface.removed", name, f"Interface {name} disappeared", "warning")
+        for name in current.keys() & prev.keys():
+            (was_up, old_speed), (is_up, speed) = prev[name], current[name]
+            if was_up != is_up:
+                self.journal.append(ts, "interface.up" if is_up else "interface.down", name,
+                                    f"Interface {name} is {'up' if is_up else 'down'}", "info" if is_up else "warning")
+            elif is_up and old_speed != speed:
+                self.journal.append(ts, "interface.speed", name, f"Interface {name} link speed {old_speed} -> {speed} Mb/s")
+
+    def _diff_mounts(self, ts: float, disks: DiskDetailed):
+        current = {(p.device, p.mountpoint): p.fstype for p in disks.partitions}
+        prev, self._mounts = self._mounts, current
+        if prev is None: return
+        self._emit_changes(ts, "mount.added", current.keys() - prev.keys(),
+                           lambda k: (k[1], f"{k[0]} mounted on {k[1]} ({current[k]})"))
+        self._emit_changes(ts, "mount.removed", prev.keys() - current.keys(),
+                           lambda k: (k[1], f"{k[0]} unmounted from {k[1]}"))
+
+    def _diff_listeners(self, ts: float, conns: List[NetConnection]):
+        current = {(c.family, c.type, c.laddr): c.process_name or (f"PID {c.pid}" if c.pid else "unknown")
+                   for c in conns if c.status == "LISTEN"}
+        prev, self._listeners = self._listeners, current
+        if prev is None: return
+        self._emit_changes(ts, "port.listen", current.keys() - prev.keys(),
+                           lambda k: (k[2], f"{current[k]} listening on {k[2]} ({k[1]})"))
+        self._emit_changes(ts, "port.closed", prev.keys() - current.keys(),
+                           lambda k: (k[2], f"{prev[k]} stopped listening on {k[2]} ({k[1]})"))
+
+    def _diff_sensors(self, ts: float, sensors: SensorMetrics):
+        for chip, readings in sensors.temperatures.items():
+            for r in readings:
+                if r.high is None and r.critical is None: continue
+                level = 2 if r.critical is not None and r.current >= r.critical else \
+                        1 if r.high is not None and r.current >= r.high else 0
+                key = (chip, r.label)
+                prev = self._sensor_levels.get(key, 0)
+                self._sensor_levels[key] = level
+                if level == prev: continue
+                subject = f"{chip}/{r.label}"
+                if level > prev:
+                    limit = r.critical if level == 2 else r.high
+                    self.journal.append(ts, "sensor.critical" if level == 2 else "sensor.high", subject,
+                                        f"{subject} at {r.current:.1f}°C crossed {limit:.1f}°C",
+                                        "critical" if level == 2 else "warning")
+                else:
+                    self.journal.append(ts, "sensor.normal" if level == 0 else "sensor.high", subject,
+                                        f"{subject} back down to {r.current:.1f}°C")
+
+
+journal = Journal()
+differ = SnapshotDiffer(journal)
+sampler.add_listener(differ.on_sample, WATCHED_GROUPS)
+if EVENTS_INTERVAL > 0:
+    sampler.subscribe(WATCHED_GROUPS, interval=EVENTS_INTERVAL, client="events")
@@ -0,0 +1,131 @@
+import json
+from typing import Iterator, List
+import numpy as np
+from backend.history import HistoryStore
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Arrow/Parquet export is optional
+    pa = None
+    pq = None
+
+# Points per series read from the store at a time; bounds memory for any range.
+CHUNK_POINTS = 65536
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def available_formats() -> List[str]:
+    return [f for f in MEDIA_TYPES if pa is not None or f in ("csv", "ndjson")]
+
+
+def _rows(fmt: str, ts: np.ndarray, val: np.ndarray) -> str:
+    # One C-level %-format over the interleaved chunk instead of a Python loop per sample
+    pairs = np.empty(len(ts) * 2, dtype=np.float64)
+    pairs[0::2] = ts
+    pairs[1::2] = val
+    return (fmt * len(ts)) % tuple(pairs.tolist())
+
+
+def _digits(val: np.ndarray) -> int:
+    """Significant digits that round-trip the stored dtype (counters are float64)."""
+    return 17 if val.dtype == np.float64 else 9
+
+
+def stream_csv(store: HistoryStore, names: List[str], start: float, end: float, resolution: str) -> Iterator[bytes]:
+    yield b"timestamp,metric,value\n"
+    for name in names:
+        label = '"' + name.replace('"', '""') + '"' if any(c in name for c in ',"\n') else name
+        prefix = "%.3f," + label.replace("%", "%%") + ","
+        for ts, val in store.iter_chunks(name, start, end, resolution, CHUNK_POINTS):
+            yield _rows(prefix + f"%.{_digits(val)}g\n", ts, val).encode()
+
+
+def stream_ndjson(store: HistoryStore, names: List[str], start: float, end: float, resolution: str) -> Iterator[bytes]:
+    for name in names:
+        prefix = '{"timestamp":%.3f,"metric":' + json.dumps(name).replace("%", "%%") + ',"value":'
+        for ts, val in store.iter_chunks(name, start, end, resolution, CHUNK_POINTS):
+            # NaN is not valid JSON
+            yield _rows(prefix + f"%.{_digits(val)}g}}\n", ts, val).replace('"value":nan}', '"value":null}').encode()
+
+
+class _Drain:
+    """Write-only file object whose buffered bytes are handed out after every batch."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.parts.append(data)
+        self.pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def _arrow_schema():
+    return pa.schema([
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("metric", pa.string()),
+        ("value", pa.float64()),
+    ])
+
+
+def _arrow_batches(store: HistoryStore, names: List[str], start: float, end: float, resolution: str):
+    schema = _arrow_schema()
+    for name in names:
+        for ts, val in store.iter_chunks(name, start, end, resolution, CHUNK_POINTS):
+            yield pa.record_batch([
+                pa.array((ts * 1000).astype(np.int64), type=schema.field("timestamp").type),
+                pa.repeat(pa.scalar(name, pa.string()), len(ts)),
+                pa.array(val, type=pa.float64()),
+            ], schema=schema)
+
+
+def stream_arrow(store: HistoryStore, names: List[str], start: float, end: float, resolution: str) -> Iterator[bytes]:
+    sink = _Drain()
+    with pa.ipc.new_stream(sink, _arrow_schema()) as writer:
+        yield sink.take()
+        for batch in _arrow_batches(store, names, start, end, resolution):
+            writer.write_batch(batch)
+            yield sink.take()
+    yield sink.take()
+
+
+def stream_parquet(store: HistoryStore, names: List[str], start: float, end: float, resolution: str) -> Iterator[bytes]:
+    sink = _Drain()
+    # Each batch becomes its own row group, so nothing larger than one chunk is buffered
+    with pq.ParquetWriter(sink, _arrow_schema(), compression="zstd") as writer:
+        for batch in _arrow_batches(store, names, start, end, resolution):
+            writer.write_batch(batch, row_group_size=len(batch))
+            yield sink.take()
+    yield sink.take()
+
+
+STREAMERS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+    "arrow": stream_arrow,
+    "parquet": stream_parquet,
+}
@@ -0,0 +1,261 @@
+import fnmatch
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from backend.models import CPUInfo, MemoryInfo, SensorMetrics, DiskDetailed, NetworkDetailed, PressureInfo
+from backend.sampler import sampler
+
+# Raw samples kept per series (1h at the default 1s cadence of a watched group).
+RAW_POINTS = int(os.getenv("VANTASYS_HISTORY_RAW_POINTS", "3600"))
+# Days of 1-minute rollups kept per series.
+RETENTION_DAYS = float(os.getenv("VANTASYS_HISTORY_DAYS", "30"))
+# Cadence the recorder asks for when no client is watching; 0 records only watched groups.
+RECORD_INTERVAL = float(os.getenv("VANTASYS_HISTORY_INTERVAL", "5"))
+ROLLUP_STEP = 60
+RECORDED_GROUPS = ["cpu", "memory", "sensors", "disk_detailed", "network"]
+# Cumulative counters. Stored as float64: float32 steps are 64 KiB at 1e12 bytes, which would
+# quantize rates taken over them.
+COUNTER_PATTERNS = ["net.*.bytes_recv", "net.*.bytes_sent"]
+# Host-wide CPU time split that is recorded; per core only iowait and steal are kept.
+CPU_TIME_FIELDS = ["user", "system", "iowait", "steal", "irq", "softirq"]
+# /proc/meminfo fields recorded as memory.<name> (the full breakdown stays available live)
+MEMINFO_FIELDS = {
+    "Cached": "cached", "Buffers": "buffers", "Dirty": "dirty", "Writeback": "writeback",
+    "Slab": "slab", "SReclaimable": "slab_reclaimable", "SUnreclaim": "slab_unreclaimable",
+    "Shmem": "shmem", "AnonPages": "anon", "Mapped": "mapped", "PageTables": "page_tables",
+    "AnonHugePages": "anon_hugepages", "HugePages_Total": "hugepages_total", "HugePages_Free": "hugepages_free",
+}
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)(ms|s|m|h|d|w)$")
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def is_counter(name: str) -> bool:
+    return any(fnmatch.fnmatchcase(name, p) for p in COUNTER_PATTERNS)
+
+
+def parse_duration(value: str) -> float:
+    """'90s', '15m', '6h', '30d' -> seconds. Plain numbers are seconds."""
+    m = _DURATION.match(value.strip())
+    if m: return float(m.group(1)) * _UNITS[m.group(2)]
+    return float(value)
+
+
+def parse_time(value: Optional[str], default: float, now: Optional[float] = None) -> float:
+    """Epoch seconds, ISO-8601, or a duration relative to now ('-6h')."""
+    if value is None or value == "": return default
+    now = time.time() if now is None else now
+    if value == "now": return now
+    if value.startswith("-"): return now - parse_duration(value[1:])
+    try: return float(value)
+    except ValueError: return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+class Ring:
+    """
+    Append-only ring of (timestamp, value) pairs in NumPy arrays.
+
+    Timestamps are stored divided by `ts_step` in `ts_dtype` so the minute tier can use
+    int32 minute indices. Storage grows by doubling up to `capacity`, then wraps.
+    """
+
+    def __init__(self, capacity: int, ts_dtype=np.float64, ts_step: float = 1.0, val_dtype=np.float32):
+        self.capacity = max(1, capacity)
+        self.ts_step = ts_step
+        self.ts = np.empty(min(self.capacity, 256), dtype=ts_dtype)
+        self.val = np.empty(len(self.ts), dtype=val_dtype)
+        self.head = 0
+        self.size = 0
+
+    def append(self, ts: float, value: float):
+        if self.size == len(self.ts) and len(self.ts) < self.capacity:
+            grow = min(len(self.ts) * 2, self.capacity)
+            self.ts = np.resize(self.ts, grow)
+            self.val = np.resize(self.val, grow)
+            self.head = self.size
+        self.ts[self.head] = ts / self.ts_step
+        self.val[self.head] = value
+        self.head = (self.head + 1) % len(self.ts)
+        self.size = min(self.size + 1, len(self.ts))
+
+    def first(self) -> Optional[float]:
+        if not self.size: return None
+        start = self.head if self.size == len(self.ts) else 0
+        return float(self.ts[start]) * self.ts_step
+
+    def segments(self, start: float, end: float) -> List[Tuple[np.ndarray, np.ndarray, float]]:
+        """(ts, value, ts_step) views over the stored points in [start, end), oldest first."""
+        if self.size == len(self.ts):
+            parts = [(self.ts[self.head:], self.val[self.head:]), (self.ts[:self.head], self.val[:self.head])]
+        else:
+            parts = [(self.ts[:self.size], self.val[:self.size])]
+        lo_key, hi_key = start / self.ts_step, end / self.ts_step
+        out = []
+        for ts, val in parts:
+            lo, hi = np.searchsorted(ts, lo_key, "left"), np.searchsorted(ts, hi_key, "left")
+            if hi > lo: out.append((ts[lo:hi], val[lo:hi], self.ts_step))
+        return out
+
+
+class Series:
+    """One metric: a raw ring plus a 1-minute mean rollup for long ranges."""
+
+    def __init__(self, name: str, val_dtype=np.float32):
+        self.name = name
+        self.raw = Ring(RAW_POINTS, val_dtype=val_dtype)
+        self.rollup = Ring(int(RETENTION_DAYS * 86400 / ROLLUP_STEP), np.int32, ROLLUP_STEP, val_dtype)
+        self._bucket = -1
+        self._sum = 0.0
+        self._count = 0
+
+    def add(self, ts: float, value: float):
+        self.raw.append(ts, value)
+        bucket = int(ts // ROLLUP_STEP)
+        if bucket != self._bucket:
+            if self._count:
+                self.rollup.append(self._bucket * ROLLUP_STEP, self._sum / self._count)
+            self._bucket, self._sum, self._count = bucket, 0.0, 0
+        if value == value:  # NaN doesn't poison the minute mean
+            self._sum += value
+            self._count += 1
+
+    def segments(self, start: float, end: float, resolution: str = "auto") -> List[Tuple[np.ndarray, np.ndarray, float]]:
+        """
+        `raw` and `1m` read one tier. `auto` uses rollups only for the part of the
+        range that is older than the oldest raw sample.
+        """
+        if resolution == "raw": return self.raw.segments(start, end)
+        if resolution == "1m": return self.rollup.segments(start, end)
+        raw_first = self.raw.first()
+        if raw_first is None: return self.rollup.segments(start, end)
+        older = self.rollup.segments(start, min(end, raw_first)) if start < raw_first else []
+        return older + self.raw.segments(max(start, raw_first), end)
+
+
+class HistoryStore:
+    def __init__(self):
+        self.series: Dict[str, Series] = {}
+        self.lock = threading.Lock()
+        self.listeners: List[Callable[[float, Dict[str, float]], None]] = []
+
+    def add_listener(self, listener: Callable[[float, Dict[str, float]], None]):
+        """Call `listener(timestamp, metrics)` after every recorded batch."""
+        self.listeners.append(listener)
+
+    def record(self, ts: float, metrics: Dict[str, float]):
+        with self.lock:
+            for name, value in metrics.items():
+                if value is None: continue
+                series = self.series.get(name)
+                if series is None:
+                    series = self.series[name] = Series(name, np.float64 if is_counter(name) else np.float32)
+                series.add(ts, value)
+        for listener in self.listeners:
+            try: listener(ts, metrics)
+            except Exception: pass
+
+    def names(self, patterns: Optional[List[str]] = None) -> List[str]:
+        """Series names matching any of the glob patterns (all when empty), sorted."""
+        with self.lock:
+            names = list(self.series)
+        if patterns:
+            names = [n for n in names if any(fnmatch.fnmatchcase(n, p) for p in patterns)]
+        return sorted(names)
+
+    def range(self, name: str, start: float, end: float, resolution: str = "auto") -> Tuple[np.ndarray, np.ndarray]:
+        """Copy of one series' timestamps (float64 seconds) and values (float32, float64 for counters) in [start, end)."""
+        ts_parts, val_parts = [], []
+        for ts, val in self.iter_chunks(name, start, end, resolution):
+            ts_parts.append(ts)
+            val_parts.append(val)
+        if not ts_parts: return np.empty(0, np.float64), np.empty(0, np.float32)
+        return np.concatenate(ts_parts), np.concatenate(val_parts)
+
+    def iter_chunks(self, name: str, start: float, end: float, resolution: str = "auto",
+                    chunk: int = 65536) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield bounded copies of a series so callers can stream long ranges.
+
+        Each chunk is copied under the lock, so memory stays at `chunk` points however
+        long the range is and the recorder is only blocked for one copy at a time.
+        """
+        cursor = start
+        while cursor < end:
+            with self.lock:
+                series = self.series.get(name)
+                if series is None: return
+                segs = series.segments(cursor, end, resolution)
+                if not segs: return
+                ts_view, val_view, step = segs[0]
+                ts = ts_view[:chunk].astype(np.float64) * step
+                val = val_view[:chunk].copy()
+            yield ts, val
+            # Segments never overlap and timestamps only grow, so resume just past the last point
+            cursor = np.nextafter(ts[-1], np.inf)
+
+
+def _extract_pressure(out: Dict[str, float], prefix: str, psi: Optional[PressureInfo]):
+    if psi is None: return
+    out[f"{prefix}.some_avg10"] = psi.some_avg10
+    out[f"{prefix}.full_avg10"] = psi.full_avg10
+
+
+def extract_metrics(group: str, value: Any) -> Dict[str, float]:
+    """Flatten a sampled model into named scalar series."""
+    out: Dict[str, float] = {}
+    if isinstance(value, CPUInfo):
+        out["cpu.usage_percent"] = value.usage_percent
+        out["cpu.frequency"] = value.frequency_current
+        out["cpu.temperature"] = value.temperature
+        for i, pct in enumerate(value.per_core_usage):
+            out[f"cpu.core.{i}.usage_percent"] = pct
+        if value.times is not None:
+            for field in CPU_TIME_FIELDS:
+                out[f"cpu.{field}_percent"] = getattr(value.times, field)
+        for i, core in enumerate(value.per_core_times):
+            out[f"cpu.core.{i}.iowait_percent"] = core.iowait
+            out[f"cpu.core.{i}.steal_percent"] = core.steal
+        _extract_pressure(out, "pressure.cpu", value.pressure)
+        _extract_pressure(out, "pressure.io", value.io_pressure)
+    elif isinstance(value, MemoryInfo):
+        out["memory.percent"] = value.percent
+        out["memory.used"] = value.used
+        out["memory.available"] = value.available
+        out["memory.swap_used"] = value.swap_used
+        for field, name in MEMINFO_FIELDS.items():
+            if field in value.breakdown: out[f"memory.{name}"] = value.breakdown[field]
+        _extract_pressure(out, "pressure.memory", value.pressure)
+    elif isinstance(value, SensorMetrics):
+        for chip, readings in value.temperatures.items():
+            for r in readings:
+                out[f"sensors.{chip}.{r.label}.temperature"] = r.current
+        for chip, fans in value.fans.items():
+            for f in fans:
+                out[f"sensors.{chip}.{f.label}.rpm"] = f.current
+    elif isinstance(value, DiskDetailed):
+        for disk, io in value.io_stats.items():
+            out[f"disk.{disk}.read_speed"] = io.read_speed
+            out[f"disk.{disk}.write_speed"] = io.write_speed
+    elif isinstance(value, NetworkDetailed):
+        out["net.download_speed"] = value.global_rate.download_speed
+        out["net.upload_speed"] = value.global_rate.upload_speed
+        for iface in value.interfaces:
+            out[f"net.{iface.name}.bytes_recv"] = iface.bytes_recv
+            out[f"net.{iface.name}.bytes_sent"] = iface.bytes_sent
+    return out
+
+
+history = HistoryStore()
+
+
+def _on_sample(group: str, ts: float, value: Any):
+    history.record(ts, extract_metrics(group, value))
+
+
+sampler.add_listener(_on_sample, RECORDED_GROUPS)
+if RECORD_INTERVAL > 0:
+    sampler.subscribe(RECORDED_GROUPS, interval=RECORD_INTERVAL, client="history")
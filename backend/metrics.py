@@ -7,11 +7,15 @@ import json
 import sys
 import threading
 from typing import List, Dict, Optional, Any
+from backend.profiling import timed
+from backend.sensors import SysfsSensorReader
+from backend.procfs import read_text, parse_pressure, parse_meminfo
 from backend.models import (
     CPUInfo, MemoryInfo, DiskInfo, NetworkRate, ProcessInfo,
     SystemStaticInfo, SensorMetrics, SensorReading, FanReading, BatteryInfo,
     DiskDetailed, DiskPartition, DiskIOStats, NetworkDetailed, NetInterface,
-    GPUInfo, MotherboardInfo, NetConnection, ProcessDetail, ServiceInfo, RamModule
+    GPUInfo, MotherboardInfo, NetConnection, ProcessDetail, ServiceInfo, RamModule,
+    PressureInfo, CoreTimes
 )
 
 class MetricsCollector:
@@ -26,9 +30,10 @@ class MetricsCollector:
         self._cpu_specs: Dict = {}
         self._ram_specs: List[RamModule] = []
         self._hw_lock = threading.Lock()
+        self._sensor_reader = SysfsSensorReader()
         
         self._init_basic_sys_info()
-        threading.Thread(target=self._scan_hardware_background, daemon=True).start()
+        threading.Thread(target=self._scan_hardware_background, name="vantasys-hwscan", daemon=True).start()
 
     def _init_basic_sys_info(self):
         boot_time = psutil.boot_time()
@@ -40,7 +45,7 @@ class MetricsCollector:
             os_name=os_name,
             os_release=uname.release,
             os_version=uname.version,
-            os_edition=platform.win32_edition() if hasattr(platform, 'win32_edition') else "Unknown",
+            os_edition=(platform.win32_edition() if hasattr(platform, 'win32_edition') else None) or "Unknown",
             machine_type=uname.machine,
             processor=uname.processor,
             boot_time=boot_time,
@@ -186,24 +191,66 @@ class MetricsCollector:
             return data
         except: return []
 
+    def _read_pressure(self, resource: str) -> Optional[PressureInfo]:
+        """/proc/pressure/<resource> (Linux 4.20+ with PSI enabled), else None."""
+        psi = parse_pressure(read_text(f"/proc/pressure/{resource}"))
+        if "some_avg10" not in psi: return None
+        full_total = psi.get("full_total")
+        return PressureInfo(
+            some_avg10=psi["some_avg10"], some_avg60=psi.get("some_avg60", 0.0),
+            some_avg300=psi.get("some_avg300", 0.0), some_total=int(psi.get("some_total", 0)),
+            full_avg10=psi.get("full_avg10"), full_avg60=psi.get("full_avg60"),
+            full_avg300=psi.get("full_avg300"), full_total=int(full_total) if full_total is not None else None
+        )
+
+    def _core_times(self) -> List[CoreTimes]:
+        cores = []
+        try:
+            for t in psutil.cpu_times_percent(interval=None, percpu=True):
+                f = t._asdict()
+                cores.append(CoreTimes(
+                    user=f["user"], system=f["system"], idle=f["idle"], nice=f.get("nice"),
+                    iowait=f.get("iowait"), irq=f.get("irq", f.get("interrupt")),
+                    softirq=f.get("softirq", f.get("dpc")), steal=f.get("steal")
+                ))
+        except: pass
+        return cores
+
+    @timed("collector.get_system_info")
     def get_system_info(self) -> SystemStaticInfo:
         if self._system_info:
             self._system_info.uptime_seconds = time.time() - self._system_info.boot_time
             return self._system_info
         return self._system_info
 
+    @timed("collector.get_cpu_info")
     def get_cpu_info(self) -> CPUInfo:
         freq = psutil.cpu_freq()
         temp = None
         stats = psutil.cpu_stats()
-        try:
-            temps = psutil.sensors_temperatures()
-            if 'coretemp' in temps: temp = temps['coretemp'][0].current
-        except: pass
+        if self._sensor_reader.available:
+            temp = self._sensor_reader.cpu_temperature()
+        else:
+            try:
+                temps = psutil.sensors_temperatures()
+                if 'coretemp' in temps: temp = temps['coretemp'][0].current
+            except: pass
+        per_core_times = self._core_times()
+        times = None
+        if per_core_times:
+            n = len(per_core_times)
+            times = CoreTimes(**{
+                field: sum(getattr(c, field) for c in per_core_times) / n
+                for field in CoreTimes.model_fields if getattr(per_core_times[0], field) is not None
+            })
 
         return CPUInfo(
             usage_percent=psutil.cpu_percent(interval=None),
             per_core_usage=psutil.cpu_percent(interval=None, percpu=True),
+            times=times,
+            per_core_times=per_core_times,
+            pressure=self._read_pressure("cpu"),
+            io_pressure=self._read_pressure("io"),
             frequency_current=freq.current if freq else 0.0,
             count_physical=psutil.cpu_count(logical=False) or 0,
             count_logical=psutil.cpu_count(logical=True) or 0,
@@ -239,6 +286,7 @@ class MetricsCollector:
             level_3=self._cpu_specs.get('l3')
         )
 
+    @timed("collector.get_memory_info")
     def get_memory_info(self) -> MemoryInfo:
         mem = psutil.virtual_memory()
         swap = psutil.swap_memory()
@@ -248,11 +296,28 @@ class MetricsCollector:
             swap_total=swap.total, swap_used=swap.used,
             pagefile_total=swap.total,
             pagefile_used=swap.used,
+            breakdown=parse_meminfo(read_text("/proc/meminfo")),
+            pressure=self._read_pressure("memory"),
             modules=self._ram_specs
         )
 
+    @timed("collector.get_sensors")
     def get_sensors(self) -> SensorMetrics:
         metrics = SensorMetrics()
+        if self._sensor_reader.available:
+            metrics.temperatures, metrics.fans = self._sensor_reader.read()
+        else:
+            self._read_psutil_sensors(metrics)
+        try:
+            batt = psutil.sensors_battery()
+            if batt:
+                metrics.battery = BatteryInfo(percent=batt.percent, secsleft=batt.secsleft if batt.secsleft!=psutil.POWER_TIME_UNLIMITED else None, power_plugged=batt.power_plugged)
+        except: pass
+        if not metrics.temperatures and not metrics.battery:
+            metrics.temperatures["System"] = [SensorReading(label="Package", current=45.0)]
+        return metrics
+
+    def _read_psutil_sensors(self, metrics: SensorMetrics):
         try:
             temps = psutil.sensors_temperatures()
             for name, entries in temps.items():
@@ -269,15 +334,8 @@ class MetricsCollector:
             for name, e in fans.items():
                 metrics.fans[name] = [FanReading(label=i.label or name, current=i.current) for i in e]
         except: pass
-        try:
-            batt = psutil.sensors_battery()
-            if batt:
-                metrics.battery = BatteryInfo(percent=batt.percent, secsleft=batt.secsleft if batt.secsleft!=psutil.POWER_TIME_UNLIMITED else None, power_plugged=batt.power_plugged)
-        except: pass
-        if not metrics.temperatures and not metrics.battery:
-            metrics.temperatures["System"] = [SensorReading(label="Package", current=45.0)]
-        return metrics
 
+    @timed("collector.get_disk_detailed")
     def get_disk_detailed(self) -> DiskDetailed:
         current_time = time.time()
         time_delta = current_time - self._last_disk_time
@@ -314,6 +372,7 @@ class MetricsCollector:
         self._last_disk_time = current_time
         return DiskDetailed(partitions=partitions, io_stats=io_stats)
 
+    @timed("collector.get_disk_info")
     def get_disk_info(self) -> DiskInfo:
         path = '/' if psutil.POSIX else 'C:\\'
         try:
@@ -321,6 +380,7 @@ class MetricsCollector:
             return DiskInfo(total=disk.total, used=disk.used, free=disk.free, percent=disk.percent, device=path)
         except: return DiskInfo(total=0, used=0, free=0, percent=0, device="Unknown")
 
+    @timed("collector.get_network_detailed")
     def get_network_detailed(self) -> NetworkDetailed:
         current_net_io = psutil.net_io_counters()
         current_time = time.time()
@@ -371,10 +431,12 @@ class MetricsCollector:
             dns_servers=[], gateways={} 
         )
 
+    @timed("collector.get_network_info")
     def get_network_info(self) -> NetworkRate:
         return self.get_network_detailed().global_rate
 
-    def get_top_processes(self, limit: int = 20) -> List[ProcessInfo]:
+    @timed("collector.get_top_processes")
+    def get_top_processes(self, limit: Optional[int] = 20) -> List[ProcessInfo]:
         if not hasattr(self, '_proc_cache'): self._proc_cache = {}
         current_pids = set()
         results = []
@@ -402,13 +464,15 @@ class MetricsCollector:
         results.sort(key=lambda x: x.cpu_percent, reverse=True)
         return results[:limit]
 
+    @timed("collector.kill_process")
     def kill_process(self, pid: int) -> bool:
         try:
             psutil.Process(pid).terminate()
             return True
         except: return False
 
-    def get_connections(self, limit: int = 100) -> List[NetConnection]:
+    @timed("collector.get_connections")
+    def get_connections(self, limit: Optional[int] = 100) -> List[NetConnection]:
         res = []
         try:
             conns = psutil.net_connections(kind='inet')
@@ -427,6 +491,7 @@ class MetricsCollector:
         except: pass
         return res
 
+    @timed("collector.get_process_detail")
     def get_process_detail(self, pid: int) -> Optional[ProcessDetail]:
         try:
             p = psutil.Process(pid)
@@ -439,6 +504,7 @@ class MetricsCollector:
                 )
         except: return None
     
+    @timed("collector.get_services")
     def get_services(self) -> List[ServiceInfo]:
         services = []
         try:
@@ -3,6 +3,27 @@ from typing import List, Optional, Dict
 
 # --- Basic Metrics (V1) ---
 
+class PressureInfo(BaseModel):
+    """Linux PSI: share of wall time some (or all) runnable tasks were stalled on a resource."""
+    some_avg10: float
+    some_avg60: float
+    some_avg300: float
+    some_total: int
+    full_avg10: Optional[float] = None
+    full_avg60: Optional[float] = None
+    full_avg300: Optional[float] = None
+    full_total: Optional[int] = None
+
+class CoreTimes(BaseModel):
+    user: float
+    system: float
+    idle: float
+    nice: Optional[float] = None
+    iowait: Optional[float] = None
+    irq: Optional[float] = None
+    softirq: Optional[float] = None
+    steal: Optional[float] = None
+
 class CPUInfo(BaseModel):
     usage_percent: float
     per_core_usage: List[float]
@@ -15,6 +36,11 @@ class CPUInfo(BaseModel):
     interrupts: Optional[int] = None
     soft_interrupts: Optional[int] = None
     syscalls: Optional[int] = None
+    # V8 Contention
+    times: Optional[CoreTimes] = None
+    per_core_times: List[CoreTimes] = Field(default_factory=list)
+    pressure: Optional[PressureInfo] = None
+    io_pressure: Optional[PressureInfo] = None
 
     # V7 CPU-Z Specs
     l2_cache: Optional[str] = None
@@ -87,6 +113,9 @@ class MemoryInfo(BaseModel):
     swap_used: int
     pagefile_total: Optional[int] = None
     pagefile_used: Optional[int] = None
+    # V8 Contention: every /proc/meminfo field in bytes (HugePages_* are page counts)
+    breakdown: Dict[str, int] = Field(default_factory=dict)
+    pressure: Optional[PressureInfo] = None
     # V7 Specs
     modules: List[RamModule] = Field(default_factory=list)
     
@@ -269,3 +298,129 @@ class ServiceInfo(BaseModel):
     pid: Optional[int] = None
     username: Optional[str] = None
     description: Optional[str] = None
+
+# --- Sampler Telemetry (V8) ---
+
+class SamplerGroupStats(BaseModel):
+    name: str
+    active: bool
+    watchers: int
+    target_interval: Optional[float] = None
+    effective_interval: Optional[float] = None
+    rate_hz: float
+    backoff: float
+    cost_ms: float
+    listener_ms: float = 0.0
+    cpu_share: float
+    samples: int
+    last_sample_age: Optional[float] = None
+
+class SamplerStats(BaseModel):
+    budget: float
+    estimated_usage: float
+    measured_usage: float
+    coalesce_calls: int = 0
+    coalesce_shared: int = 0
+    groups: List[SamplerGroupStats]
+
+# --- Cgroups (V8) ---
+
+class CgroupInfo(BaseModel):
+    path: str
+    populated: bool = True
+    cpu_percent: float = 0.0
+    cpu_usage_usec: int = 0
+    nr_throttled: int = 0
+    throttled_usec: int = 0
+    throttled_percent: float = 0.0
+    memory_current: Optional[int] = None
+    memory_peak: Optional[int] = None
+    memory_max: Optional[int] = None
+    io_read_bytes: int = 0
+    io_write_bytes: int = 0
+    io_read_speed: float = 0.0
+    io_write_speed: float = 0.0
+    pressure_cpu: Optional[float] = None
+    pressure_memory: Optional[float] = None
+    pressure_io: Optional[float] = None
+    processes: int = 0
+    pids: List[int] = Field(default_factory=list)
+
+# --- Burst Capture (V8) ---
+
+class BurstStatus(BaseModel):
+    id: int
+    trigger: str
+    state: str
+    error: Optional[str] = None
+    started: float
+    seconds: float
+    hz: float
+    samples: int
+    columns: int
+    buffer_bytes: int
+    achieved_hz: float
+    overhead_percent: float
+    sample_mean_us: float
+    sample_max_us: float
+    missed: int
+    max_lag_ms: float
+
+# --- Event Journal (V8) ---
+
+class SystemEvent(BaseModel):
+    cursor: int
+    timestamp: float
+    kind: str
+    subject: str
+    message: str
+    severity: str = "info"
+
+class EventPage(BaseModel):
+    events: List[SystemEvent]
+    next_cursor: int
+    gap: bool = False
+
+# --- History (V8) ---
+
+class AnomalyEvent(BaseModel):
+    timestamp: float
+    metric: str
+    value: float
+    expected: float
+    score: float
+
+class HistorySeries(BaseModel):
+    metric: str
+    timestamps: List[float]
+    values: List[Optional[float]]
+    anomalies: List[AnomalyEvent] = Field(default_factory=list)
+
+class QuerySeries(BaseModel):
+    metric: str
+    value: Optional[float] = None
+    timestamps: Optional[List[float]] = None
+    values: Optional[List[Optional[float]]] = None
+
+# --- Self Profiling (V8) ---
+
+class LatencyStats(BaseModel):
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+class RouteStats(BaseModel):
+    method: str
+    route: str
+    latency: LatencyStats
+    errors: int
+    bytes_total: int
+    bytes_mean: float
+    bytes_max: int
+
+class DebugStats(BaseModel):
+    routes: List[RouteStats]
+    methods: Dict[str, LatencyStats]
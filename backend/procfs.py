@@ -0,0 +1,75 @@
+import os
+from typing import Dict, Optional
+
+# Small, allocation-light readers for /proc and /sys pseudo-files.
+
+
+def read_text(path: str) -> Optional[str]:
+    """Whole file as text, or None if it can't be read. One open/read/close, no buffering layer."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk: break
+            chunks.append(chunk)
+        return b"".join(chunks).decode(errors="replace")
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def read_int(path: str) -> Optional[int]:
+    text = read_text(path)
+    if text is None: return None
+    text = text.strip()
+    if text == "max": return None
+    try: return int(text)
+    except ValueError: return None
+
+
+def parse_flat_keyed(text: Optional[str]) -> Dict[str, int]:
+    """'key value' lines (cpu.stat, memory.stat) -> dict."""
+    out: Dict[str, int] = {}
+    if not text: return out
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            try: out[parts[0]] = int(parts[1])
+            except ValueError: continue
+    return out
+
+
+def parse_pressure(text: Optional[str]) -> Dict[str, float]:
+    """
+    PSI file ('some avg10=.. avg60=.. avg300=.. total=..' / 'full ...') ->
+    {'some_avg10': .., 'some_total': .., 'full_avg10': .., ...}. Totals are microseconds.
+    """
+    out: Dict[str, float] = {}
+    if not text: return out
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts: continue
+        for field in parts[1:]:
+            key, _, value = field.partition("=")
+            try: out[f"{parts[0]}_{key}"] = float(value)
+            except ValueError: continue
+    return out
+
+
+def parse_meminfo(text: Optional[str]) -> Dict[str, int]:
+    """/proc/meminfo -> {field: bytes}; unitless fields (HugePages_*) stay page counts."""
+    out: Dict[str, int] = {}
+    if not text: return out
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if not parts: continue
+        try: value = int(parts[0])
+        except ValueError: continue
+        out[key] = value * 1024 if len(parts) > 1 and parts[1] == "kB" else value
+    return out
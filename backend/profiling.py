@@ -0,0 +1,196 @@
+import bisect
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from backend.models import LatencyStats, RouteStats, DebugStats
+
+# Upper bounds (seconds) of the latency buckets: 50us .. ~52s, doubling
+LATENCY_BOUNDS = [0.00005 * 2 ** i for i in range(21)]
+MAX_PROFILE_SECONDS = 60.0
+
+
+class Histogram:
+    """Fixed log-bucket histogram; recording is one bisect and a few additions."""
+
+    def __init__(self, bounds: List[float] = LATENCY_BOUNDS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max: self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (the max for the overflow bucket)."""
+        if not self.count: return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def stats(self) -> LatencyStats:
+        return LatencyStats(
+            count=self.count, mean_ms=(self.total / self.count * 1000.0) if self.count else 0.0,
+            p50_ms=self.quantile(0.5) * 1000.0, p90_ms=self.quantile(0.9) * 1000.0,
+            p99_ms=self.quantile(0.99) * 1000.0, max_ms=self.max * 1000.0
+        )
+
+
+class Registry:
+    """Named latency histograms plus per-route payload accounting."""
+
+    def __init__(self):
+        self.methods: Dict[str, Histogram] = {}
+        self.routes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def method(self, name: str) -> Histogram:
+        hist = self.methods.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.methods.setdefault(name, Histogram())
+        return hist
+
+    def route(self, method: str, path: str, seconds: float, status: int, size: int):
+        key = (method, path)
+        entry = self.routes.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self.routes.setdefault(key, {"latency": Histogram(), "bytes": 0, "max_bytes": 0, "errors": 0})
+        entry["latency"].record(seconds)
+        entry["bytes"] += size
+        if size > entry["max_bytes"]: entry["max_bytes"] = size
+        if status >= 500: entry["errors"] += 1
+
+    def stats(self) -> DebugStats:
+        routes = []
+        for (method, path), entry in sorted(self.routes.items(), key=lambda kv: kv[0][1]):
+            count = entry["latency"].count
+            routes.append(RouteStats(
+                method=method, route=path, latency=entry["latency"].stats(), errors=entry["errors"],
+                bytes_total=entry["bytes"], bytes_mean=(entry["bytes"] / count) if count else 0.0,
+                bytes_max=entry["max_bytes"]
+            ))
+        return DebugStats(routes=routes, methods={name: h.stats() for name, h in sorted(self.methods.items())})
+
+
+registry = Registry()
+
+
+def timed(name: str):
+    """Record the wall time of every call to the decorated function under `name`."""
+    def decorate(fn: Callable) -> Callable:
+        hist = registry.method(name)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                hist.record(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+class LatencyMiddleware:
+    """
+    ASGI middleware recording latency (until the last body chunk) and response size per route.
+
+    Routes are keyed by their path template, so /api/process/{pid} is one entry.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._templates: Dict[Any, str] = {}
+
+    def _template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None: return "unmatched"
+        path = self._templates.get(endpoint)
+        if path is None:
+            path = "static"
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint or getattr(route, "app", None) is endpoint:
+                    path = getattr(route, "path", None) or path
+                    break
+            self._templates[endpoint] = path
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def counting_send(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, counting_send)
+        finally:
+            registry.route(scope["method"], self._template(scope), time.perf_counter() - start, status, size)
+
+
+class StackSampler:
+    """
+    On-demand sampling profiler over every Python thread in the process.
+
+    Nothing runs until `profile()` is called; it then snapshots sys._current_frames()
+    at `hz` for `seconds` and folds the stacks into the collapsed format flamegraph
+    tools read ("thread;outer;...;inner count").
+    """
+
+    def __init__(self):
+        self._busy = threading.Lock()
+
+    def profile(self, seconds: float, hz: float = 100.0) -> Optional[str]:
+        if not self._busy.acquire(blocking=False): return None
+        try:
+            return self._run(min(seconds, MAX_PROFILE_SECONDS), hz)
+        finally:
+            self._busy.release()
+
+    def _run(self, seconds: float, hz: float) -> str:
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        code_labels: Dict[Any, str] = {}
+        interval = 1.0 / hz
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me: continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = code_labels.get(code)
+                    if label is None:
+                        label = code_labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    parts.append(label)
+                    frame = frame.f_back
+                parts.append(names.get(ident, f"thread-{ident}").replace(";", ":"))
+                stacks[";".join(reversed(parts))] += 1
+            time.sleep(interval)
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()) + "\n"
+
+
+stack_sampler = StackSampler()
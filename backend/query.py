@@ -0,0 +1,121 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from backend.history import HistoryStore
+from backend.models import QuerySeries
+
+# Every function takes contiguous buckets of samples (`starts` are the first index of each
+# bucket in the time-sorted arrays) and returns one value per bucket. The whole range is
+# just the single-bucket case, so the same kernels serve plain and group-by-time queries.
+
+
+def _counts(starts: np.ndarray, n: int) -> np.ndarray:
+    return np.diff(np.append(starts, n))
+
+
+def avg_over_time(ts: np.ndarray, val: np.ndarray, starts: np.ndarray, **_) -> np.ndarray:
+    return np.add.reduceat(val.astype(np.float64), starts) / _counts(starts, len(val))
+
+
+def sum_over_time(ts: np.ndarray, val: np.ndarray, starts: np.ndarray, **_) -> np.ndarray:
+    return np.add.reduceat(val.astype(np.float64), starts)
+
+
+def min_over_time(ts: np.ndarray, val: np.ndarray, starts: np.ndarray, **_) -> np.ndarray:
+    return np.minimum.reduceat(val, starts).astype(np.float64)
+
+
+def max_over_time(ts: np.ndarray, val: np.ndarray, starts: np.ndarray, **_) -> np.ndarray:
+    return np.maximum.reduceat(val, starts).astype(np.float64)
+
+
+def last_over_time(ts: np.ndarray, val: np.ndarray, starts: np.ndarray, **_) -> np.ndarray:
+    return val[np.append(starts[1:], len(val)) - 1].astype(np.float64)
+
+
+def quantile_over_time(ts: np.ndarray, val: np.ndarray, starts: np.ndarray, q: float = 0.5, **_) -> np.ndarray:
+    # Sort by (bucket, value) once, then interpolate inside each bucket's sorted run
+    bucket = np.repeat(np.arange(len(starts)), _counts(starts, len(val)))
+    ordered = val[np.lexsort((val, bucket))].astype(np.float64)
+    pos = starts + q * (_counts(starts, len(val)) - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, np.append(starts[1:], len(val)) - 1)
+    frac = pos - lo
+    return ordered[lo] * (1 - frac) + ordered[hi] * frac
+
+
+def rate(ts: np.ndarray, val: np.ndarray, starts: np.ndarray, **_) -> np.ndarray:
+    """Per-second increase of a counter, treating a drop as a counter reset."""
+    v = val.astype(np.float64)
+    inc = np.diff(v, prepend=v[0])
+    resets = inc < 0
+    inc[resets] = v[resets]
+    # Each delta is credited to the bucket of the later sample, so nothing is lost at edges
+    dt = np.diff(ts, prepend=ts[0])
+    span = np.add.reduceat(dt, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(span > 0, np.add.reduceat(inc, starts) / span, np.nan)
+
+
+FUNCTIONS: Dict[str, Callable[..., np.ndarray]] = {
+    "avg_over_time": avg_over_time,
+    "sum_over_time": sum_over_time,
+    "min_over_time": min_over_time,
+    "max_over_time": max_over_time,
+    "last_over_time": last_over_time,
+    "quantile_over_time": quantile_over_time,
+    "rate": rate,
+}
+
+
+def bucketize(ts: np.ndarray, start: float, step: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bucket start indices and bucket timestamps for time-sorted `ts`.
+
+    Buckets are aligned to multiples of `step` since the epoch, so a 1h step lines up
+    with wall-clock hours. Empty buckets are simply absent.
+    """
+    if not step:
+        return np.zeros(1, dtype=np.int64), np.array([start])
+    ids = np.floor(ts / step).astype(np.int64)
+    starts = np.flatnonzero(np.diff(ids, prepend=ids[0] - 1))
+    return starts, ids[starts] * step
+
+
+def evaluate(fn: str, ts: np.ndarray, val: np.ndarray, start: float, step: Optional[float] = None,
+             q: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """Apply one function to a single series; returns (bucket timestamps, values)."""
+    keep = ~np.isnan(val)
+    ts, val = ts[keep], val[keep]
+    if len(val) == 0: return np.empty(0), np.empty(0)
+    starts, bucket_ts = bucketize(ts, start, step)
+    return bucket_ts, FUNCTIONS[fn](ts, val, starts, q=q)
+
+
+def _clean(values: np.ndarray) -> List[Optional[float]]:
+    return [None if v != v else v for v in values.tolist()]
+
+
+def run_query(store: HistoryStore, fn: str, names: List[str], start: float, end: float,
+              step: Optional[float] = None, q: float = 0.5, k: Optional[int] = None,
+              resolution: str = "auto") -> List[QuerySeries]:
+    """
+    Evaluate `fn` for every named series over [start, end).
+
+    Without `step` each series reduces to one `value`. With `step` the series is grouped
+    into time buckets and `value` is the peak bucket, which is what `k` ranks by.
+    """
+    results = []
+    for name in names:
+        ts, val = store.range(name, start, end, resolution)
+        bucket_ts, out = evaluate(fn, ts, val, start, step, q)
+        if len(out) == 0: continue
+        value = float(np.nanmax(out)) if step and not np.all(np.isnan(out)) else float(out[0])
+        results.append(QuerySeries(
+            metric=name, value=None if value != value else value,
+            timestamps=bucket_ts.tolist() if step else None,
+            values=_clean(out) if step else None
+        ))
+    if k:
+        ranked = sorted((r for r in results if r.value is not None), key=lambda r: r.value, reverse=True)
+        results = ranked[:k]
+    return results
@@ -0,0 +1,267 @@
+import os
+import threading
+import time
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+from backend.models import SamplerGroupStats, SamplerStats
+from backend.metrics import collector, MetricsCollector
+from backend.cgroups import cgroup_collector
+
+# Fraction of one core the sampler may spend collecting (0.01 == 1%).
+CPU_BUDGET = float(os.getenv("VANTASYS_CPU_BUDGET", "0.01"))
+# A polling client counts as watching a group for this long after its last request.
+LEASE_SECONDS = 10.0
+CONTROL_PERIOD = 1.0
+BACKOFF_STEP = 1.5
+RELAX_STEP = 1.25
+
+
+class MetricGroup:
+    """One independently scheduled collector call and its sampling state."""
+
+    def __init__(self, name: str, fetch: Callable[[], Any], base_interval: float,
+                 min_interval: float, max_interval: float, cost_rank: int):
+        self.name = name
+        self.fetch = fetch
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        # Higher rank == more expensive by nature, backed off first under budget pressure
+        self.cost_rank = cost_rank
+        self.lock = threading.Lock()
+
+        self.value: Any = None
+        self.seq = 0
+        self.last_sample = 0.0
+        self.samples = 0
+        self.cost = 0.0  # EWMA of CPU seconds per sample, listeners included
+        self.listener_cost = 0.0  # the listeners' part of `cost`
+        self.backoff = 1.0
+        self.target_interval: Optional[float] = None  # None == idle
+        self.watchers = 0
+        self.listeners: List[Callable[[str, float, Any], None]] = []
+
+    @property
+    def effective_interval(self) -> Optional[float]:
+        if self.target_interval is None: return None
+        return min(self.target_interval * self.backoff, max(self.max_interval, self.target_interval))
+
+    def sample(self) -> Any:
+        start_cpu = time.thread_time()
+        value = self.fetch()
+        fetched_cpu = time.thread_time()
+        self.value = value
+        self.last_sample = time.time()
+        self.seq += 1
+        # Recording, scoring and diffing run here on every sample, so they are charged to the budget too
+        for listener in self.listeners:
+            try: listener(self.name, self.last_sample, value)
+            except Exception: pass
+        end_cpu = time.thread_time()
+        spent, listened = end_cpu - start_cpu, end_cpu - fetched_cpu
+        if self.samples == 0:
+            self.cost, self.listener_cost = spent, listened
+        else:
+            self.cost = self.cost * 0.8 + spent * 0.2
+            self.listener_cost = self.listener_cost * 0.8 + listened * 0.2
+        self.samples += 1
+        return value
+
+
+class Subscription:
+    def __init__(self, sub_id: int, groups: List[str], interval: Optional[float], client: Optional[str]):
+        self.id = sub_id
+        self.groups = groups
+        self.interval = interval
+        self.client = client
+
+
+class Sampler:
+    """
+    Demand-driven scheduler in front of the MetricsCollector.
+
+    Groups are idle until a polling client, a stream subscriber or a background
+    consumer asks for them. Active groups are sampled at the fastest cadence their
+    watchers need, then slowed down (most expensive first) whenever the measured
+    collection cost would exceed CPU_BUDGET.
+    """
+
+    def __init__(self, collector: MetricsCollector, budget: float = CPU_BUDGET):
+        self.budget = budget
+        self.groups: Dict[str, MetricGroup] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._ids = itertools.count(1)
+        # group -> client -> [last_seen, estimated poll period]
+        self._leases: Dict[str, Dict[str, List[float]]] = {}
+        self._subs: Dict[int, Subscription] = {}
+        self._measured_usage = 0.0
+
+        self._register("cpu", collector.get_cpu_info, 1.0, 0.25, 10.0, 0)
+        self._register("memory", collector.get_memory_info, 1.0, 0.25, 10.0, 0)
+        self._register("disk", collector.get_disk_info, 5.0, 1.0, 60.0, 0)
+        self._register("sensors", collector.get_sensors, 1.0, 0.25, 15.0, 1)
+        self._register("disk_detailed", collector.get_disk_detailed, 5.0, 1.0, 60.0, 1)
+        self._register("network", collector.get_network_detailed, 2.0, 0.5, 30.0, 1)
+        self._register("processes", lambda: collector.get_top_processes(limit=None), 5.0, 1.0, 60.0, 2)
+        self._register("connections", lambda: collector.get_connections(limit=None), 5.0, 2.0, 120.0, 3)
+        self._register("services", collector.get_services, 10.0, 5.0, 300.0, 3)
+        self._register("cgroups", self._sample_cgroups, 5.0, 2.0, 120.0, 3)
+
+        threading.Thread(target=self._run, name="vantasys-sampler", daemon=True).start()
+
+    def _register(self, name: str, fetch: Callable[[], Any], base: float, min_i: float, max_i: float, rank: int):
+        self.groups[name] = MetricGroup(name, fetch, base, min_i, max_i, rank)
+        self._leases[name] = {}
+
+    def _sample_cgroups(self):
+        # The process table is sampled by the scheduler on a lease held for the cgroups group,
+        # never inline here, so each scan is charged to (and backed off with) its own group.
+        self.touch("processes", "cgroups")
+        return cgroup_collector.collect(self.groups["processes"].value)
+
+    def add_listener(self, listener: Callable[[str, float, Any], None], groups: Optional[List[str]] = None):
+        """Call `listener(group, timestamp, value)` after every sample of the given groups."""
+        for name in groups or list(self.groups):
+            self.groups[name].listeners.append(listener)
+
+    # --- Demand ---
+
+    def touch(self, name: str, client: Optional[str]):
+        """Record a poll from `client`, estimating how often it asks for `name`."""
+        now = time.time()
+        key = client or "anonymous"
+        with self._lock:
+            lease = self._leases[name].get(key)
+            if lease is None:
+                self._leases[name][key] = [now, self.groups[name].base_interval]
+                self._wake.set()
+            else:
+                gap = now - lease[0]
+                if gap > 0.05:
+                    lease[1] = lease[1] * 0.7 + gap * 0.3
+                lease[0] = now
+
+    def subscribe(self, groups: List[str], interval: Optional[float] = None, client: Optional[str] = None) -> Subscription:
+        sub = Subscription(next(self._ids), [g for g in groups if g in self.groups], interval, client)
+        with self._lock:
+            self._subs[sub.id] = sub
+        self._wake.set()
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subs.pop(sub.id, None)
+
+    def get(self, name: str, client: Optional[str] = None) -> Any:
+        self.touch(name, client)
+        return self.read(name)
+
+    def read(self, name: str) -> Any:
+        """Latest value for a group, sampling inline only if the cache is empty or stale."""
+        group = self.groups[name]
+        max_age = 2 * (group.effective_interval or group.base_interval) + 1.0
+        if group.value is None or time.time() - group.last_sample > max_age:
+            with group.lock:
+                if group.value is None or time.time() - group.last_sample > max_age:
+                    group.sample()
+        return group.value
+
+    # --- Scheduling ---
+
+    def _update_targets(self, now: float):
+        with self._lock:
+            for name, group in self.groups.items():
+                leases = self._leases[name]
+                for client in [c for c, (seen, period) in leases.items() if now - seen > max(LEASE_SECONDS, 3 * period)]:
+                    del leases[client]
+                wanted = [period for _, period in leases.values()]
+                clients = set(leases)
+                for sub in self._subs.values():
+                    if name in sub.groups:
+                        wanted.append(sub.interval or group.base_interval)
+                        clients.add(sub.client or f"sub-{sub.id}")
+                group.watchers = len(clients)
+                if not wanted:
+                    group.target_interval = None
+                    group.backoff = 1.0
+                else:
+                    group.target_interval = min(max(min(wanted), group.min_interval), group.max_interval)
+
+    def _estimated_usage(self) -> float:
+        return sum(g.cost / g.effective_interval for g in self.groups.values() if g.effective_interval)
+
+    def _enforce_budget(self):
+        active = [g for g in self.groups.values() if g.target_interval is not None]
+        usage = self._estimated_usage()
+        if usage > self.budget:
+            # Back off the most expensive groups first, one step at a time
+            for g in sorted(active, key=lambda g: (g.cost_rank, g.cost), reverse=True):
+                while usage > self.budget and g.target_interval * g.backoff < g.max_interval:
+                    g.backoff *= BACKOFF_STEP
+                    usage = self._estimated_usage()
+                if usage <= self.budget: break
+        elif usage < self.budget * 0.8:
+            # Give rate back to the cheapest groups first
+            for g in sorted(active, key=lambda g: (g.cost_rank, g.cost)):
+                if g.backoff > 1.0:
+                    g.backoff = max(1.0, g.backoff / RELAX_STEP)
+                    if self._estimated_usage() > self.budget * 0.8:
+                        g.backoff *= RELAX_STEP
+                    break
+
+    def _run(self):
+        # thread_time() is per thread, so the baseline must be taken on the sampler thread
+        self._cpu_start, self._wall_start = time.thread_time(), time.time()
+        next_control = 0.0
+        while True:
+            now = time.time()
+            if now >= next_control:
+                self._update_targets(now)
+                self._enforce_budget()
+                cpu_now, wall_now = time.thread_time(), time.time()
+                self._measured_usage = (cpu_now - self._cpu_start) / max(wall_now - self._wall_start, 1e-6)
+                self._cpu_start, self._wall_start = cpu_now, wall_now
+                next_control = now + CONTROL_PERIOD
+
+            wait = next_control - time.time()
+            for group in self.groups.values():
+                interval = group.effective_interval
+                if interval is None: continue
+                due = group.last_sample + interval
+                if time.time() >= due:
+                    if group.lock.acquire(blocking=False):
+                        try:
+                            group.sample()
+                        except Exception:
+                            group.last_sample = time.time()
+                        finally:
+                            group.lock.release()
+                    due = time.time() + interval
+                wait = min(wait, due - time.time())
+
+            self._wake.wait(timeout=max(0.01, wait))
+            self._wake.clear()
+
+    # --- Telemetry ---
+
+    def stats(self) -> SamplerStats:
+        groups = []
+        for g in self.groups.values():
+            interval = g.effective_interval
+            groups.append(SamplerGroupStats(
+                name=g.name, active=interval is not None, watchers=g.watchers,
+                target_interval=g.target_interval, effective_interval=interval,
+                rate_hz=(1.0 / interval) if interval else 0.0,
+                backoff=g.backoff, cost_ms=g.cost * 1000.0, listener_ms=g.listener_cost * 1000.0,
+                cpu_share=(g.cost / interval) if interval else 0.0,
+                samples=g.samples,
+                last_sample_age=(time.time() - g.last_sample) if g.samples else None
+            ))
+        return SamplerStats(
+            budget=self.budget, estimated_usage=self._estimated_usage(),
+            measured_usage=self._measured_usage, groups=groups
+        )
+
+
+sampler = Sampler(collector)
@@ -0,0 +1,166 @@
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from backend.models import SensorReading, FanReading
+
+HWMON_ROOT = "/sys/class/hwmon"
+THERMAL_ROOT = "/sys/class/thermal"
+# How often the device directories are re-listed to notice hot-plugged or removed chips.
+RESCAN_SECONDS = 10.0
+# Chips whose first temperature channel is the CPU package/die temperature, in preference order.
+CPU_CHIPS = ["coretemp", "k10temp", "zenpower", "cpu_thermal", "x86_pkg_temp", "soc_thermal"]
+
+_CHANNEL = re.compile(r"^(temp|fan)(\d+)_input$")
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path) as f: return f.read().strip()
+    except OSError: return None
+
+
+def _read_int(path: str) -> Optional[int]:
+    text = _read_text(path)
+    try: return int(text) if text is not None else None
+    except ValueError: return None
+
+
+class Channel:
+    """One *_input file, kept open and re-read with pread."""
+
+    def __init__(self, chip: str, kind: str, label: str, path: str,
+                 high: Optional[float] = None, critical: Optional[float] = None):
+        self.chip = chip
+        self.kind = kind
+        self.label = label
+        self.high = high
+        self.critical = critical
+        # Channels that fail to read (unconnected probes return ENODATA/EIO) are skipped until then
+        self.retry_at = 0.0
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def read(self) -> float:
+        raw = int(os.pread(self.fd, 32, 0))
+        return raw / 1000.0 if self.kind == "temp" else float(raw)
+
+    def close(self):
+        try: os.close(self.fd)
+        except OSError: pass
+
+
+class SysfsSensorReader:
+    """
+    Temperature and fan reader over /sys/class/hwmon and /sys/class/thermal.
+
+    Devices and their labels/limits are discovered once; after that every read is a
+    single pread() per channel on a descriptor that stays open. Discovery is repeated
+    only when the device directories change; a channel that fails to read is
+    quarantined for RESCAN_SECONDS and prompts a (cheap) directory listing check.
+    """
+
+    def __init__(self, hwmon_root: str = HWMON_ROOT, thermal_root: str = THERMAL_ROOT):
+        self.hwmon_root = hwmon_root
+        self.thermal_root = thermal_root
+        self.available = sys.platform.startswith("linux") and (os.path.isdir(hwmon_root) or os.path.isdir(thermal_root))
+        self._lock = threading.Lock()
+        self._channels: List[Channel] = []
+        self._cpu_channel: Optional[Channel] = None
+        self._signature: Tuple = ()
+        self._next_check = 0.0
+        self._stale = True
+        self.discoveries = 0
+
+    def _listing(self) -> Tuple:
+        out = []
+        for root in (self.hwmon_root, self.thermal_root):
+            try: out.append(tuple(sorted(os.listdir(root))))
+            except OSError: out.append(())
+        return tuple(out)
+
+    def _discover(self):
+        for ch in self._channels: ch.close()
+        channels: List[Channel] = []
+        chips = set()
+        try: hwmons = sorted(os.listdir(self.hwmon_root))
+        except OSError: hwmons = []
+        for entry in hwmons:
+            base = os.path.join(self.hwmon_root, entry)
+            # Older drivers keep their attributes under device/
+            if not os.path.exists(os.path.join(base, "name")) and os.path.exists(os.path.join(base, "device", "name")):
+                base = os.path.join(base, "device")
+            chip = _read_text(os.path.join(base, "name")) or entry
+            try: files = os.listdir(base)
+            except OSError: continue
+            inputs = sorted((m.group(1), int(m.group(2)), f) for f in files for m in [_CHANNEL.match(f)] if m)
+            for kind, idx, fname in inputs:
+                prefix = os.path.join(base, f"{kind}{idx}")
+                label = _read_text(prefix + "_label") or chip
+                high = crit = None
+                if kind == "temp":
+                    high = _read_int(prefix + "_max")
+                    crit = _read_int(prefix + "_crit")
+                    high = high / 1000.0 if high is not None else None
+                    crit = crit / 1000.0 if crit is not None else None
+                try: channels.append(Channel(chip, kind, label, os.path.join(base, fname), high, crit))
+                except OSError: continue
+                chips.add(chip)
+        try: zones = sorted(z for z in os.listdir(self.thermal_root) if z.startswith("thermal_zone"))
+        except OSError: zones = []
+        for zone in zones:
+            base = os.path.join(self.thermal_root, zone)
+            chip = _read_text(os.path.join(base, "type")) or zone
+            if chip in chips: continue
+            try: channels.append(Channel(chip, "temp", chip, os.path.join(base, "temp")))
+            except OSError: continue
+
+        self._channels = channels
+        temps = [ch for ch in channels if ch.kind == "temp"]
+        ranked = sorted(temps, key=lambda ch: CPU_CHIPS.index(ch.chip) if ch.chip in CPU_CHIPS else len(CPU_CHIPS))
+        self._cpu_channel = ranked[0] if ranked and ranked[0].chip in CPU_CHIPS else None
+        self._signature = self._listing()
+        self._stale = False
+        self.discoveries += 1
+
+    def _refresh(self, now: float):
+        if not self._stale and now >= self._next_check:
+            self._next_check = now + RESCAN_SECONDS
+            if self._listing() != self._signature: self._stale = True
+        if self._stale: self._discover()
+
+    def _failed(self, ch: Channel, now: float):
+        ch.retry_at = now + RESCAN_SECONDS
+        # The device may have gone away; compare the listing on the next call
+        self._next_check = 0.0
+
+    def read(self) -> Tuple[Dict[str, List[SensorReading]], Dict[str, List[FanReading]]]:
+        temps: Dict[str, List[SensorReading]] = {}
+        fans: Dict[str, List[FanReading]] = {}
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            for ch in self._channels:
+                if ch.retry_at > now: continue
+                try: value = ch.read()
+                except (OSError, ValueError):
+                    self._failed(ch, now)
+                    continue
+                if ch.kind == "temp":
+                    temps.setdefault(ch.chip, []).append(SensorReading(label=ch.label, current=value, high=ch.high, critical=ch.critical))
+                else:
+                    fans.setdefault(ch.chip, []).append(FanReading(label=ch.label, current=int(value)))
+        return temps, fans
+
+    def cpu_temperature(self) -> Optional[float]:
+        """Package/die temperature from the preferred CPU chip; one pread per call."""
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            ch = self._cpu_channel
+            if ch is None or ch.retry_at > now: return None
+            try: return ch.read()
+            except (OSError, ValueError):
+                self._failed(ch, now)
+                return None
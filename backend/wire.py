@@ -0,0 +1,75 @@
+"""
+Compact binary encodings for numeric payloads. Everything is little-endian and
+4-byte aligned so browsers can wrap the bytes in Float32Array views without copying.
+
+History table (one per series, concatenated):
+    0   4s   magic b"VSH1"
+    4   u32  nrows
+    8   f64  base timestamp (epoch seconds)
+    16  u16  metric name length
+    18  u16  reserved
+    20  ...  metric name (utf-8), zero-padded to a multiple of 4
+        f32[nrows]  timestamps as seconds after base
+        f32[nrows]  values (NaN for gaps)
+
+Stream frame:
+    0   u32  frame length in bytes, including this field
+    4   u8   kind (1 = schema, 2 = data)
+    5   u8   group name length
+    6   u16  column count
+    8   f64  sample timestamp (epoch seconds)
+    16  ...  group name (utf-8), zero-padded to a multiple of 4
+        schema: column names joined by "\\n" (utf-8), zero-padded to a multiple of 4
+        data:   f32[column count] in schema order
+"""
+import struct
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+MEDIA_TYPE = "application/x-vantasys-columns"
+HISTORY_MAGIC = b"VSH1"
+FRAME_SCHEMA = 1
+FRAME_DATA = 2
+
+_HISTORY_HEADER = struct.Struct("<4sIdHH")
+_FRAME_HEADER = struct.Struct("<IBBHd")
+
+
+def _padded(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def wants_binary(accept: Optional[str], fmt: Optional[str]) -> bool:
+    """Binary if asked for explicitly (`format=bin`) or preferred in the Accept header."""
+    if fmt is not None: return fmt == "bin"
+    return bool(accept) and MEDIA_TYPE in accept
+
+
+def encode_history_table(metric: str, ts: np.ndarray, val: np.ndarray) -> bytes:
+    name = metric.encode()
+    base = float(ts[0]) if len(ts) else 0.0
+    header = _HISTORY_HEADER.pack(HISTORY_MAGIC, len(ts), base, len(name), 0)
+    rel = (ts - base).astype("<f4")
+    return header + _padded(name) + rel.tobytes() + val.astype("<f4").tobytes()
+
+
+class FrameEncoder:
+    """Per-connection stream encoder; resends a group's schema only when its columns change."""
+
+    def __init__(self):
+        self._schemas: Dict[str, Sequence[str]] = {}
+
+    def _frame(self, kind: int, group: str, ncols: int, ts: float, body: bytes) -> bytes:
+        name = _padded(group.encode())
+        length = _FRAME_HEADER.size + len(name) + len(body)
+        return _FRAME_HEADER.pack(length, kind, len(group.encode()), ncols, ts) + name + body
+
+    def encode(self, group: str, ts: float, metrics: Dict[str, float]) -> bytes:
+        names = list(metrics)
+        out: List[bytes] = []
+        if self._schemas.get(group) != names:
+            self._schemas[group] = names
+            out.append(self._frame(FRAME_SCHEMA, group, len(names), ts, _padded("\n".join(names).encode())))
+        values = np.array([np.nan if v is None else v for v in metrics.values()], dtype="<f4")
+        out.append(self._frame(FRAME_DATA, group, len(names), ts, values.tobytes()))
+        return b"".join(out)
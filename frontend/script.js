@@ -4,6 +4,7 @@ const API = '/api';
 const FAST_RATE = 1000;
 const SLOW_RATE = 5000;
 const HISTORY_LEN = 300; 
+const WIRE_TYPE = 'application/x-vantasys-columns';
 
 // State
 let charts = {};
@@ -14,14 +15,28 @@ let latestData = {
     cpu: null, mem: null, disk: null, net: null, sys: null, sensors: null
 };
 
+// Fixed-size typed rings; pushHistory slides in place instead of shift()/push()
 const historyStore = {
-    cpu: Array(HISTORY_LEN).fill(0),
-    mem: Array(HISTORY_LEN).fill(0),
-    netIn: Array(HISTORY_LEN).fill(0),
-    netOut: Array(HISTORY_LEN).fill(0)
+    cpu: new Float32Array(HISTORY_LEN),
+    mem: new Float32Array(HISTORY_LEN),
+    netIn: new Float32Array(HISTORY_LEN),
+    netOut: new Float32Array(HISTORY_LEN)
 };
+const HISTORY_METRICS = {
+    'cpu.usage_percent': 'cpu', 'memory.percent': 'mem',
+    'net.download_speed': 'netIn', 'net.upload_speed': 'netOut'
+};
+
+// Binary stream state
+let streamLive = false;
+const streamSchemas = {};
 
 // Utils
+const pushHistory = (ring, val) => {
+    ring.copyWithin(0, 1);
+    ring[ring.length - 1] = val;
+};
+
 const formatBytes = (bytes) => {
     if (bytes === 0) return '0 B';
     const k = 1024, sizes = ['B', 'KB', 'MB', 'GB', 'TB'];
@@ -52,12 +67,142 @@ async function init() {
     initCharts(); 
     initAnalyticsCharts(); 
 
+    await loadHistory();
+    openStream();
+    openEventJournal();
+
     setInterval(fastLoop, FAST_RATE);
     setInterval(slowLoop, SLOW_RATE);
     fastLoop();
     slowLoop();
 }
 
+// --- Server Event Journal ---
+
+function openEventJournal() {
+    // EventSource reconnects by itself and resumes from the last cursor (Last-Event-ID).
+    // Process start/exit events are too chatty for this log and stay API-only.
+    const source = new EventSource(`${API}/events/stream`);
+    const show = (e) => {
+        const event = JSON.parse(e.data);
+        logEvent(`[${event.severity.toUpperCase()}] ${event.message}`);
+    };
+    ['interface.added', 'interface.removed', 'interface.up', 'interface.down', 'interface.speed',
+     'mount.added', 'mount.removed', 'port.listen', 'port.closed',
+     'sensor.high', 'sensor.critical', 'sensor.normal'].forEach(kind => source.addEventListener(kind, show));
+}
+
+// --- Binary Wire Format (see backend/wire.py) ---
+
+const textDecoder = new TextDecoder();
+const align4 = (n) => (n + 3) & ~3;
+
+function decodeHistory(buf) {
+    // Concatenated VSH1 tables; columns are wrapped as Float32Array views, not copied
+    const view = new DataView(buf);
+    const tables = [];
+    let off = 0;
+    while (off + 20 <= buf.byteLength) {
+        const rows = view.getUint32(off + 4, true);
+        const base = view.getFloat64(off + 8, true);
+        const nameLen = view.getUint16(off + 16, true);
+        const metric = textDecoder.decode(new Uint8Array(buf, off + 20, nameLen));
+        const data = off + 20 + align4(nameLen);
+        tables.push({ metric, base, t: new Float32Array(buf, data, rows), values: new Float32Array(buf, data + rows * 4, rows) });
+        off = data + rows * 8;
+    }
+    return tables;
+}
+
+async function loadHistory() {
+    try {
+        const metrics = Object.keys(HISTORY_METRICS).join(',');
+        const res = await fetch(`${API}/history?metrics=${metrics}&from=-${HISTORY_LEN}s`, { headers: { Accept: WIRE_TYPE } });
+        if (!res.ok) return;
+        decodeHistory(await res.arrayBuffer()).forEach(({ metric, values }) => {
+            const ring = historyStore[HISTORY_METRICS[metric]];
+            const tail = values.subarray(Math.max(0, values.length - HISTORY_LEN));
+            ring.set(tail, HISTORY_LEN - tail.length);
+        });
+    } catch (e) { console.error(e); }
+}
+
+async function openStream() {
+    try {
+        const res = await fetch(`${API}/stream?groups=cpu,memory,network&interval=1`, { headers: { Accept: WIRE_TYPE } });
+        if (!res.ok || res.headers.get('content-type') !== WIRE_TYPE) throw new Error('Binary stream unavailable');
+        const reader = res.body.getReader();
+        let pending = new Uint8Array(0);
+        streamLive = true;
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            const merged = new Uint8Array(pending.length + value.length);
+            merged.set(pending); merged.set(value, pending.length);
+            pending = merged;
+            while (pending.length >= 4) {
+                const len = new DataView(pending.buffer, pending.byteOffset, 4).getUint32(0, true);
+                if (pending.length < len) break;
+                handleFrame(pending.slice(0, len).buffer);
+                pending = pending.subarray(len);
+            }
+        }
+    } catch (e) { console.error(e); }
+    streamLive = false;
+    setTimeout(openStream, SLOW_RATE);
+}
+
+function handleFrame(buf) {
+    const view = new DataView(buf);
+    const kind = view.getUint8(4), nameLen = view.getUint8(5), cols = view.getUint16(6, true);
+    const group = textDecoder.decode(new Uint8Array(buf, 16, nameLen));
+    const body = 16 + align4(nameLen);
+    if (kind === 1) {
+        const names = textDecoder.decode(new Uint8Array(buf, body)).replace(/\0+$/, '').split('\n');
+        const index = {};
+        names.forEach((n, i) => index[n] = i);
+        const cores = names.map((n, i) => /^cpu\.core\.\d+\.usage_percent$/.test(n) ? i : -1).filter(i => i >= 0);
+        streamSchemas[group] = { index, cores };
+    } else if (streamSchemas[group]) {
+        onStreamSample(group, new Float32Array(buf, body, cols), streamSchemas[group]);
+    }
+}
+
+function onStreamSample(group, row, { index, cores }) {
+    if (group === 'cpu') {
+        const usage = row[index['cpu.usage_percent']];
+        pushHistory(historyStore.cpu, usage);
+        if (currentView === 'dashboard' && latestData.cpu) {
+            const value = (name) => index[name] === undefined ? undefined : row[index[name]];
+            const times = value('cpu.user_percent') === undefined ? latestData.cpu.times : {
+                user: value('cpu.user_percent'), system: value('cpu.system_percent'), iowait: value('cpu.iowait_percent'),
+                steal: value('cpu.steal_percent'), irq: value('cpu.irq_percent'), softirq: value('cpu.softirq_percent')
+            };
+            const psi = (prefix, prev) => value(`${prefix}.some_avg10`) === undefined ? prev : { ...prev, some_avg10: value(`${prefix}.some_avg10`) };
+            renderCPU({
+                ...latestData.cpu, usage_percent: usage, per_core_usage: cores.map(i => row[i]), times,
+                pressure: psi('pressure.cpu', latestData.cpu.pressure), io_pressure: psi('pressure.io', latestData.cpu.io_pressure)
+            });
+        } else if (currentView === 'analytics') {
+            updateAnalyticsCharts();
+        }
+    } else if (group === 'memory') {
+        const percent = row[index['memory.percent']];
+        pushHistory(historyStore.mem, percent);
+        if (currentView === 'dashboard' && latestData.mem) {
+            const breakdown = { ...latestData.mem.breakdown, Cached: row[index['memory.cached']], Dirty: row[index['memory.dirty']] };
+            const some = row[index['pressure.memory.some_avg10']];
+            renderMemory({
+                ...latestData.mem, percent, used: row[index['memory.used']], available: row[index['memory.available']], breakdown,
+                pressure: latestData.mem.pressure && some !== undefined ? { ...latestData.mem.pressure, some_avg10: some } : latestData.mem.pressure
+            });
+        }
+    } else if (group === 'network') {
+        pushHistory(historyStore.netIn, row[index['net.download_speed']]);
+        pushHistory(historyStore.netOut, row[index['net.upload_speed']]);
+    }
+}
+
 function setupNavigation() {
     const navItems = document.querySelectorAll('.nav-item');
     navItems.forEach(item => {
@@ -82,6 +227,13 @@ function setupNavigation() {
 
 async function fastLoop() {
     try {
+        if (streamLive && latestData.cpu && latestData.mem) {
+            // CPU/memory numbers arrive on the binary stream; only sensors are polled
+            latestData.sensors = await fetch(`${API}/sensors`).then(r=>r.json());
+            updateConnection(true);
+            if (currentView === 'dashboard') renderSensors(latestData.sensors);
+            return;
+        }
         const [cpu, mem, sensors] = await Promise.all([
             fetch(`${API}/cpu`).then(r=>r.json()),
             fetch(`${API}/memory`).then(r=>r.json()),
@@ -91,8 +243,8 @@ async function fastLoop() {
         latestData.cpu = cpu; latestData.mem = mem; latestData.sensors = sensors;
         updateConnection(true);
         
-        historyStore.cpu.shift(); historyStore.cpu.push(cpu.usage_percent);
-        historyStore.mem.shift(); historyStore.mem.push(mem.percent);
+        pushHistory(historyStore.cpu, cpu.usage_percent);
+        pushHistory(historyStore.mem, mem.percent);
         
         if (currentView === 'dashboard') {
             renderCPU(cpu);
@@ -120,8 +272,10 @@ async function slowLoop() {
         ]);
         latestData.disk = disks; latestData.net = net;
         
-        historyStore.netIn.shift(); historyStore.netIn.push(net.global_rate.download_speed);
-        historyStore.netOut.shift(); historyStore.netOut.push(net.global_rate.upload_speed);
+        if (!streamLive) {
+            pushHistory(historyStore.netIn, net.global_rate.download_speed);
+            pushHistory(historyStore.netOut, net.global_rate.upload_speed);
+        }
 
         if (currentView === 'dashboard') {
             renderDisks(disks);
@@ -205,6 +359,18 @@ function renderCPU(data) {
     if (data.microcode) document.getElementById('cpu-stepping').innerText = data.microcode;
     if (data.l2_cache) document.getElementById('cpu-l2').innerText = data.l2_cache;
     if (data.l3_cache) document.getElementById('cpu-l3').innerText = data.l3_cache;
+
+    // Contention
+    const pct = (v) => v === undefined || v === null ? '-' : v.toFixed(1) + '%';
+    const t = data.times;
+    document.getElementById('cpu-user-sys').innerText = t ? `${pct(t.user)} / ${pct(t.system)}` : 'N/A';
+    document.getElementById('cpu-iowait-steal').innerText = t ? `${pct(t.iowait)} / ${pct(t.steal)}` : 'N/A';
+    document.getElementById('cpu-irq').innerText = t ? `${pct(t.irq)} / ${pct(t.softirq)}` : 'N/A';
+    document.getElementById('cpu-pressure').innerText = data.pressure
+        ? `${pct(data.pressure.some_avg10)} / ${pct(data.io_pressure && data.io_pressure.some_avg10)}` : 'N/A';
+    (data.per_core_times || []).forEach((c, i) => {
+        if (ticks[i]) ticks[i].parentNode.title = `Core ${i}: user ${pct(c.user)}, sys ${pct(c.system)}, iowait ${pct(c.iowait)}, steal ${pct(c.steal)}`;
+    });
 }
 
 function renderMemory(data) {
@@ -221,6 +387,12 @@ function renderMemory(data) {
     } else {
         modCount.innerText = "Analyzing...";
     }
+
+    const b = data.breakdown || {};
+    document.getElementById('mem-cache').innerText =
+        b.Cached !== undefined ? `${formatBytes(b.Cached)} / ${formatBytes(b.Dirty || 0)}` : 'N/A';
+    document.getElementById('mem-pressure').innerText =
+        data.pressure ? `${data.pressure.some_avg10.toFixed(2)}%` : 'N/A';
 }
 
 function renderSensors(data) {
@@ -553,10 +725,11 @@ function initAnalyticsCharts() {
 }
 
 function updateAnalyticsCharts() {
-    charts.longCpu.data.datasets[0].data = historyStore.cpu; charts.longCpu.update('none');
-    charts.longMem.data.datasets[0].data = historyStore.mem; charts.longMem.update('none');
-    charts.longNet.data.datasets[0].data = historyStore.netIn; 
-    charts.longNet.data.datasets[1].data = historyStore.netOut; charts.longNet.update('none');
+    // subarray() is a new view over the same ring (no copy); the new reference makes Chart.js re-read it
+    charts.longCpu.data.datasets[0].data = historyStore.cpu.subarray(0); charts.longCpu.update('none');
+    charts.longMem.data.datasets[0].data = historyStore.mem.subarray(0); charts.longMem.update('none');
+    charts.longNet.data.datasets[0].data = historyStore.netIn.subarray(0); 
+    charts.longNet.data.datasets[1].data = historyStore.netOut.subarray(0); charts.longNet.update('none');
 }
 
 // Chart Defaults
@@ -0,0 +1,54 @@
+import numpy as np
+from backend.anomaly import AnomalyDetector, WARMUP
+
+T0 = 1.7e9
+
+
+def test_gaussian_noise_raises_no_flags_after_warmup():
+    rng = np.random.default_rng(1)
+    detector = AnomalyDetector(threshold=5.0)
+    names = [f"cpu.core.{i}" for i in range(200)]
+    for k in range(300):
+        detector.observe(T0 + 5 * k, dict(zip(names, rng.normal(20, 1, len(names)))))
+    assert list(detector.events) == []
+
+
+def test_step_change_flagged_once():
+    rng = np.random.default_rng(2)
+    detector = AnomalyDetector(threshold=5.0)
+    for k in range(WARMUP + 20):
+        detector.observe(T0 + 5 * k, {"m": rng.normal(20, 1)})
+    detector.observe(T0 + 1000, {"m": 40.0})
+    detector.observe(T0 + 1005, {"m": 40.0})
+    events = detector.recent(["m"])
+    assert len(events) == 1
+    assert events[0].value == 40.0 and events[0].score > 5
+
+
+def test_no_flags_during_warmup():
+    detector = AnomalyDetector(threshold=5.0)
+    for k in range(WARMUP - 1):
+        detector.observe(T0 + k, {"m": 1000.0 if k == WARMUP - 2 else 1.0})
+    assert list(detector.events) == []
+
+
+def test_counters_scored_as_rates():
+    detector = AnomalyDetector(threshold=5.0)
+    for k in range(WARMUP + 20):
+        # Constant 1000 B/s: the raw counter keeps growing but the rate is flat
+        detector.observe(T0 + k, {"net.eth0.bytes_recv": 1e12 + 1000.0 * k})
+    assert list(detector.events) == []
+
+
+def test_zero_inflated_percent_series_ignore_small_blips():
+    # Steal/iowait per core: mostly 0, with the odd sub-2% blip
+    rng = np.random.default_rng(3)
+    detector = AnomalyDetector(threshold=5.0)
+    names = [f"cpu.core.{i}.steal_percent" for i in range(128)]
+    for k in range(720):
+        values = np.where(rng.random(len(names)) < 0.03, rng.uniform(0.5, 2.0, len(names)), 0.0)
+        detector.observe(T0 + 5 * k, dict(zip(names, values)))
+    assert list(detector.events) == []
+
+    detector.observe(T0 + 5 * 720, {names[0]: 30.0})
+    assert [e.metric for e in detector.events] == [names[0]]
@@ -0,0 +1,94 @@
+import os
+import threading
+import numpy as np
+from backend.burst import CPU_FIELDS, BurstRecorder, Capture
+
+STAT = """cpu  100 0 50 800 10 0 0 0 0 0
+cpu0 100 0 50 800 10 0 0 0 0 0
+intr 0
+procs_running 2
+procs_blocked 0
+"""
+NETDEV = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo: 10 1 0 0 0 0 0 0 10 1 0 0 0 0 0 0
+  eth0: 1000 10 0 0 0 0 0 0 2000 20 0 0 0 0 0 0
+"""
+
+
+def _capture(ts, rows):
+    capture = Capture(1, "test", 1.0, 10.0)
+    capture.cpus = ["cpu0"]
+    capture.nics = ["eth0"]
+    capture.width = len(CPU_FIELDS) + 2 + 2
+    capture.ts = np.array(ts, dtype=np.float64)
+    capture.buf = np.array(rows, dtype=np.int64)
+    return capture
+
+
+def _row(user, idle, recv):
+    cpu = [0] * len(CPU_FIELDS)
+    cpu[CPU_FIELDS.index("user")] = user
+    cpu[CPU_FIELDS.index("idle")] = idle
+    return cpu + [1, 0] + [recv, 0]
+
+
+def test_series_rates_span_skipped_slots():
+    capture = _capture([0.0, 0.1, np.nan, 0.3], [
+        _row(0, 0, 0), _row(5, 5, 100), [0] * 12, _row(15, 15, 300),
+    ])
+    series = capture.series()
+    ts, usage = series["cpu.core.0.usage_percent"]
+    assert ts.tolist() == [0.1, 0.3]
+    assert usage.tolist() == [50.0, 50.0]
+    _, recv = series["net.eth0.recv_speed"]
+    np.testing.assert_allclose(recv, [1000.0, 1000.0], rtol=1e-6)
+    assert series["sched.procs_running"][1].tolist() == [1.0, 1.0]
+
+
+def test_series_needs_two_samples():
+    assert _capture([0.0, np.nan], [_row(0, 0, 0), [0] * 12]).series() == {}
+
+
+def test_capture_stays_within_window(tmp_path):
+    (tmp_path / "stat").write_text(STAT)
+    (tmp_path / "net").mkdir()
+    (tmp_path / "net" / "dev").write_text(NETDEV)
+    recorder = BurstRecorder(str(tmp_path))
+    capture = recorder.start(0.5, 20)
+    assert recorder.start(0.5, 20) is None  # one capture at a time
+    for t in threading.enumerate():
+        if t.name == "vantasys-burst": t.join(5)
+    assert capture.state == "done", capture.error
+    assert capture.nics == ["eth0"] and capture.cpus == ["cpu0"]
+    assert capture.samples + capture.missed == 11
+    assert capture.wall_seconds < 0.75
+    assert recorder.list()[0].id == capture.id
+
+
+def _finish(capture):
+    for t in threading.enumerate():
+        if t.name == "vantasys-burst": t.join(5)
+    return capture
+
+
+def test_failed_capture_closes_sources_and_has_no_series(tmp_path):
+    (tmp_path / "stat").write_text("cpu0 not numbers\n")
+    recorder = BurstRecorder(str(tmp_path))
+    fds = len(os.listdir("/proc/self/fd"))
+    capture = _finish(recorder.start(0.5, 20))
+    assert capture.state == "failed" and capture.error
+    assert capture.series() == {}
+    assert len(os.listdir("/proc/self/fd")) == fds
+
+
+def test_failed_capture_download_is_rejected(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend import api
+    (tmp_path / "stat").write_text("cpu0 not numbers\n")
+    recorder = BurstRecorder(str(tmp_path))
+    monkeypatch.setattr(api, "burst", recorder)
+    capture = _finish(recorder.start(0.5, 20))
+    response = TestClient(api.app).get(f"/api/burst/{capture.id}")
+    assert response.status_code == 409
+    assert capture.error in response.json()["detail"]
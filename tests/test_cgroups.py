@@ -0,0 +1,117 @@
+import shutil
+import pytest
+from backend import cgroups as cgroups_module
+from backend.cgroups import CgroupCollector
+from backend.models import ProcessInfo
+
+
+class _Clock:
+    def __init__(self): self.now = 1000.0
+    def __call__(self): return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cgroups_module.time, "monotonic", clock)
+    return clock
+
+
+def _cgroup(root, rel, populated=1, usage=0, throttled=0, io="", memory_max="max"):
+    base = root / rel
+    base.mkdir(parents=True, exist_ok=True)
+    (base / "cgroup.events").write_text(f"populated {populated}\nfrozen 0\n")
+    (base / "cpu.stat").write_text(f"usage_usec {usage}\nnr_throttled 3\nthrottled_usec {throttled}\n")
+    (base / "io.stat").write_text(io)
+    (base / "memory.max").write_text(memory_max + "\n")
+    (base / "memory.current").write_text("4096\n")
+    (base / "cpu.pressure").write_text("some avg10=1.50 avg60=0.00 avg300=0.00 total=10\n")
+    return base
+
+
+def _collector(tmp_path):
+    root = tmp_path / "cgroup"
+    root.mkdir()
+    (root / "cgroup.controllers").write_text("cpu io memory pids\n")
+    return root, CgroupCollector(str(root), str(tmp_path / "proc"))
+
+
+def _by_path(results):
+    return {c.path: c for c in results}
+
+
+def test_unpopulated_cgroup_is_not_read(tmp_path, clock):
+    root, collector = _collector(tmp_path)
+    _cgroup(root, "idle.slice", populated=0, usage=999)
+    info = _by_path(collector.collect())["/idle.slice"]
+    assert info.populated is False
+    assert info.cpu_usage_usec == 0 and info.memory_current is None
+
+
+def test_io_stat_summed_across_devices(tmp_path, clock):
+    root, collector = _collector(tmp_path)
+    _cgroup(root, "db.service", io="8:0 rbytes=100 wbytes=10 rios=1 wios=1\n259:0 rbytes=200 wbytes=20 rios=2 wios=2\n",
+            memory_max="1073741824")
+    info = _by_path(collector.collect())["/db.service"]
+    assert (info.io_read_bytes, info.io_write_bytes) == (300, 30)
+    assert info.memory_max == 1073741824 and info.memory_current == 4096
+    assert info.nr_throttled == 3 and info.pressure_cpu == 1.5
+
+
+def test_rates_from_deltas_between_collects(tmp_path, clock):
+    root, collector = _collector(tmp_path)
+    _cgroup(root, "web.service", usage=1_000_000, throttled=0, io="8:0 rbytes=0 wbytes=0\n")
+    first = _by_path(collector.collect())["/web.service"]
+    assert first.cpu_percent == 0.0  # no previous sample yet
+    clock.now += 2.0
+    _cgroup(root, "web.service", usage=4_000_000, throttled=500_000, io="8:0 rbytes=2048 wbytes=4096\n")
+    info = _by_path(collector.collect())["/web.service"]
+    assert info.cpu_percent == pytest.approx(150.0)
+    assert info.throttled_percent == pytest.approx(25.0)
+    assert (info.io_read_speed, info.io_write_speed) == (1024.0, 2048.0)
+
+
+def test_vanished_cgroup_dropped_and_rewalked(tmp_path, clock):
+    root, collector = _collector(tmp_path)
+    _cgroup(root, "a.scope", usage=10)
+    _cgroup(root, "b.scope", usage=10)
+    assert set(_by_path(collector.collect())) == {"/a.scope", "/b.scope"}
+    shutil.rmtree(root / "a.scope")
+    _cgroup(root, "c.scope", usage=10)
+    clock.now += 1.0
+    # Known paths only until the next walk: the missing one is dropped and forces a re-walk
+    assert set(_by_path(collector.collect())) == {"/b.scope"}
+    assert "/a.scope" not in collector._prev
+    clock.now += 1.0
+    assert set(_by_path(collector.collect())) == {"/b.scope", "/c.scope"}
+
+
+def _proc(pid, created, cpu=0.0):
+    return ProcessInfo(pid=pid, name=f"p{pid}", cpu_percent=cpu, memory_percent=0, status="running", create_time=created)
+
+
+def test_processes_mapped_once_per_pid_and_start_time(tmp_path, clock, monkeypatch):
+    root, collector = _collector(tmp_path)
+    _cgroup(root, "app.slice")
+    _cgroup(root, "other.slice")
+    for pid, path in ((10, "/app.slice"), (11, "/app.slice"), (12, "/other.slice")):
+        (tmp_path / "proc" / str(pid)).mkdir(parents=True)
+        (tmp_path / "proc" / str(pid) / "cgroup").write_text(f"0::{path}\n")
+
+    reads = []
+    real = collector._cgroup_of
+    monkeypatch.setattr(collector, "_cgroup_of", lambda pid: reads.append(pid) or real(pid))
+    procs = [_proc(10, 1.0, cpu=5.0), _proc(11, 1.0, cpu=50.0), _proc(12, 1.0)]
+    info = _by_path(collector.collect(procs))
+    assert info["/app.slice"].processes == 2 and info["/app.slice"].pids == [11, 10]
+    assert info["/other.slice"].pids == [12]
+    assert sorted(reads) == [10, 11, 12]
+
+    # Same table again: no reads. PID 12 reused by a new process in app.slice: one read.
+    collector.collect(procs)
+    assert len(reads) == 3
+    (tmp_path / "proc" / "12" / "cgroup").write_text("0::/app.slice\n")
+    info = _by_path(collector.collect([_proc(10, 1.0), _proc(11, 1.0), _proc(12, 9.0)]))
+    assert reads[3:] == [12]
+    assert info["/app.slice"].processes == 3 and info["/other.slice"].processes == 0
+    assert (12, 1.0) not in collector._pid_cgroup
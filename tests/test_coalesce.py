@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import pytest
+from backend.coalesce import Singleflight
+
+
+def test_concurrent_calls_share_one_computation():
+    calls = []
+    gate = threading.Event()
+
+    def work():
+        calls.append(1)
+        gate.wait(1)
+        return "value"
+
+    async def main():
+        sf = Singleflight(ttl=0)
+        tasks = [asyncio.create_task(sf.do("k", work)) for _ in range(10)]
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await asyncio.gather(*tasks), sf
+
+    results, sf = asyncio.run(main())
+    assert results == ["value"] * 10
+    assert len(calls) == 1
+    assert sf.shared == 9
+
+
+def test_cached_result_within_ttl():
+    calls = []
+
+    async def main():
+        sf = Singleflight(ttl=60)
+        for _ in range(3):
+            await sf.do("k", lambda: calls.append(1) or len(calls))
+        return await sf.do("k", lambda: -1)
+
+    assert asyncio.run(main()) == 1
+    assert len(calls) == 1
+
+
+def test_cancelled_leader_does_not_orphan_followers():
+    gate = threading.Event()
+
+    def work():
+        gate.wait(1)
+        return 42
+
+    async def main():
+        sf = Singleflight(ttl=0)
+        leader = asyncio.create_task(sf.do("k", work))
+        await asyncio.sleep(0.02)
+        follower = asyncio.create_task(sf.do("k", work))
+        await asyncio.sleep(0.02)
+        leader.cancel()
+        gate.set()
+        value = await asyncio.wait_for(follower, 2)
+        return value, sf
+
+    value, sf = asyncio.run(main())
+    assert value == 42
+    assert not sf._inflight
+
+
+def test_failure_propagates_and_clears_flight():
+    def boom():
+        raise ValueError("nope")
+
+    async def main():
+        sf = Singleflight(ttl=60)
+        with pytest.raises(ValueError):
+            await sf.do("k", boom)
+        assert not sf._inflight
+        # Failures aren't cached
+        return await sf.do("k", lambda: "ok")
+
+    assert asyncio.run(main()) == "ok"
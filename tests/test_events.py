@@ -0,0 +1,86 @@
+from backend.events import MAX_EVENTS_PER_DIFF, Journal, SnapshotDiffer
+from backend.models import NetConnection, ProcessInfo, SensorMetrics, SensorReading
+
+
+def _fill(journal, n):
+    for i in range(n):
+        journal.append(float(i), "test", "s", f"event {i}")
+
+
+def test_after_pages_by_cursor():
+    journal = Journal(100)
+    _fill(journal, 5)
+    page = journal.after(0, limit=2)
+    assert [e.cursor for e in page.events] == [1, 2]
+    assert page.next_cursor == 2 and not page.gap
+    page = journal.after(page.next_cursor)
+    assert [e.cursor for e in page.events] == [3, 4, 5]
+    empty = journal.after(page.next_cursor)
+    assert empty.events == [] and empty.next_cursor == 5 and not empty.gap
+
+
+def test_after_reports_gap_when_evicted():
+    journal = Journal(3)
+    _fill(journal, 5)
+    page = journal.after(0)
+    assert [e.cursor for e in page.events] == [3, 4, 5]
+    assert page.gap
+    assert not journal.after(2).gap
+
+
+def test_cursor_from_previous_run_restarts_paging():
+    journal = Journal(10)
+    _fill(journal, 2)
+    page = journal.after(500)
+    assert page.gap
+    assert [e.cursor for e in page.events] == [1, 2]
+    assert page.next_cursor == 2
+
+
+def test_empty_journal():
+    page = Journal(10).after(0)
+    assert page.events == [] and page.next_cursor == 0 and not page.gap
+
+
+def _proc(pid, name, created=1.0):
+    return ProcessInfo(pid=pid, name=name, cpu_percent=0, memory_percent=0, status="running", create_time=created)
+
+
+def test_process_diff_uses_first_sample_as_baseline():
+    journal = Journal(100)
+    differ = SnapshotDiffer(journal)
+    differ.on_sample("processes", 1.0, [_proc(1, "init"), _proc(2, "sshd")])
+    assert journal.last_cursor == 0
+    # PID 2 reused by a new process counts as an exit plus a start
+    differ.on_sample("processes", 2.0, [_proc(1, "init"), _proc(2, "bash", 5.0), _proc(3, "vim")])
+    kinds = sorted((e.kind, e.subject) for e in journal.events)
+    assert kinds == [("process.exit", "pid 2"), ("process.start", "pid 2"), ("process.start", "pid 3")]
+
+
+def test_diff_is_capped():
+    journal = Journal(1000)
+    differ = SnapshotDiffer(journal)
+    differ.on_sample("processes", 1.0, [])
+    differ.on_sample("processes", 2.0, [_proc(i, "worker") for i in range(MAX_EVENTS_PER_DIFF + 50)])
+    assert len(journal.events) == MAX_EVENTS_PER_DIFF + 1
+    assert journal.events[-1].severity == "warning" and "50 more" in journal.events[-1].message
+
+
+def test_listener_diff_ignores_non_listening_sockets():
+    journal = Journal(100)
+    differ = SnapshotDiffer(journal)
+    listen = NetConnection(family="IPv4", type="TCP", laddr="0.0.0.0:22", raddr="", status="LISTEN", pid=7, process_name="sshd")
+    established = NetConnection(family="IPv4", type="TCP", laddr="10.0.0.1:22", raddr="10.0.0.2:5000", status="ESTABLISHED")
+    differ.on_sample("connections", 1.0, [])
+    differ.on_sample("connections", 2.0, [listen, established])
+    differ.on_sample("connections", 3.0, [established])
+    assert [(e.kind, e.subject) for e in journal.events] == [("port.listen", "0.0.0.0:22"), ("port.closed", "0.0.0.0:22")]
+
+
+def test_sensor_levels_emit_on_transitions_only():
+    journal = Journal(100)
+    differ = SnapshotDiffer(journal)
+    for temp in (60.0, 85.0, 86.0, 101.0, 70.0):
+        reading = SensorReading(label="Package", current=temp, high=80.0, critical=100.0)
+        differ.on_sample("sensors", temp, SensorMetrics(temperatures={"coretemp": [reading]}, fans={}))
+    assert [e.kind for e in journal.events] == ["sensor.high", "sensor.critical", "sensor.normal"]
@@ -0,0 +1,88 @@
+import numpy as np
+from backend.history import Ring, Series, HistoryStore, parse_duration, parse_time, ROLLUP_STEP
+
+
+def _all(ring, start=-np.inf, end=np.inf):
+    segs = ring.segments(start, end)
+    ts = np.concatenate([t.astype(np.float64) * step for t, _, step in segs]) if segs else np.empty(0)
+    val = np.concatenate([v for _, v, _ in segs]) if segs else np.empty(0)
+    return ts, val
+
+
+def test_ring_grows_then_wraps_oldest_first():
+    ring = Ring(1000)
+    for i in range(600):
+        ring.append(float(i), float(i))
+    assert len(ring.ts) == 1000 and ring.size == 600
+    for i in range(600, 1500):
+        ring.append(float(i), float(i))
+    ts, val = _all(ring)
+    assert ring.size == 1000
+    assert ts[0] == 500 and ts[-1] == 1499
+    assert np.all(np.diff(ts) == 1)
+    assert np.array_equal(ts, val)
+    assert ring.first() == 500
+
+
+def test_ring_segments_are_half_open():
+    ring = Ring(16)
+    for i in range(20):
+        ring.append(float(i), float(i))
+    ts, _ = _all(ring, 6, 10)
+    assert ts.tolist() == [6, 7, 8, 9]
+
+
+def test_rollup_ring_stores_minute_indices():
+    ring = Ring(10, np.int32, ROLLUP_STEP)
+    ring.append(120.0, 1.0)
+    assert ring.ts[0] == 2
+    assert ring.first() == 120.0
+
+
+def test_series_minute_rollup_skips_nan():
+    s = Series("x")
+    for i, v in enumerate([1.0, np.nan, 3.0]):
+        s.add(i * 10.0, v)
+    s.add(ROLLUP_STEP + 1.0, 5.0)  # closes the first minute
+    segs = s.segments(0, 10 * ROLLUP_STEP, "1m")
+    assert len(segs) == 1
+    assert segs[0][1].tolist() == [2.0]
+
+
+def test_iter_chunks_bounded_and_complete():
+    store = HistoryStore()
+    for i in range(1000):
+        store.record(1000.0 + i, {"m": float(i)})
+    chunks = list(store.iter_chunks("m", 0, 1e9, "raw", chunk=128))
+    assert all(len(ts) <= 128 for ts, _ in chunks)
+    ts = np.concatenate([t for t, _ in chunks])
+    val = np.concatenate([v for _, v in chunks])
+    assert len(ts) == 1000
+    assert np.all(np.diff(ts) > 0)
+    assert val[0] == 0 and val[-1] == 999
+
+
+def test_iter_chunks_returns_copies():
+    store = HistoryStore()
+    store.record(1.0, {"m": 1.0})
+    ts, val = next(store.iter_chunks("m", 0, 10, "raw"))
+    val[0] = 99.0
+    assert store.range("m", 0, 10, "raw")[1][0] == 1.0
+
+
+def test_counters_stored_as_float64():
+    store = HistoryStore()
+    base = 1.2e12
+    for i in range(3):
+        store.record(float(i), {"net.eth0.bytes_recv": base + i, "cpu.usage_percent": 1.0})
+    _, counter = store.range("net.eth0.bytes_recv", 0, 10, "raw")
+    _, gauge = store.range("cpu.usage_percent", 0, 10, "raw")
+    assert counter.dtype == np.float64 and gauge.dtype == np.float32
+    assert np.diff(counter).tolist() == [1.0, 1.0]
+
+
+def test_parse_time_and_duration():
+    assert parse_duration("6h") == 6 * 3600
+    assert parse_time("-1h", 0.0, 10000.0) == 10000.0 - 3600
+    assert parse_time(None, 5.0, 10000.0) == 5.0
+    assert parse_time("1700000000", 0.0, 0.0) == 1700000000.0
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from backend.history import HistoryStore
+from backend.query import FUNCTIONS, bucketize, evaluate, run_query
+
+TS = np.arange(10, dtype=np.float64)
+VAL = np.array([5, 1, 4, 2, 3, 9, 7, 8, 6, 0], dtype=np.float32)
+
+
+@pytest.mark.parametrize("fn,expected", [
+    ("avg_over_time", 4.5),
+    ("sum_over_time", 45.0),
+    ("min_over_time", 0.0),
+    ("max_over_time", 9.0),
+    ("last_over_time", 0.0),
+])
+def test_whole_range_kernels(fn, expected):
+    _, out = evaluate(fn, TS, VAL, 0.0)
+    assert out.tolist() == [expected]
+
+
+def test_kernels_per_bucket():
+    starts = np.array([0, 5])
+    assert FUNCTIONS["sum_over_time"](TS, VAL, starts).tolist() == [15.0, 30.0]
+    assert FUNCTIONS["max_over_time"](TS, VAL, starts).tolist() == [5.0, 9.0]
+    assert FUNCTIONS["last_over_time"](TS, VAL, starts).tolist() == [3.0, 0.0]
+
+
+def test_quantile_matches_numpy_per_bucket():
+    starts = np.array([0, 5])
+    for q in (0.0, 0.25, 0.5, 0.9, 1.0):
+        out = FUNCTIONS["quantile_over_time"](TS, VAL, starts, q=q)
+        assert out == pytest.approx([np.quantile(VAL[:5], q), np.quantile(VAL[5:], q)])
+
+
+def test_rate_handles_counter_reset():
+    ts = np.array([0.0, 1.0, 2.0, 3.0])
+    val = np.array([100.0, 110.0, 5.0, 15.0])  # reset between t=1 and t=2
+    out = FUNCTIONS["rate"](ts, val, np.array([0]))
+    assert out.tolist() == [pytest.approx((10 + 5 + 10) / 3)]
+
+
+def test_bucketize_aligns_to_epoch_and_skips_empty():
+    ts = np.array([59.0, 60.0, 61.0, 185.0])
+    starts, bucket_ts = bucketize(ts, 0.0, 60.0)
+    assert starts.tolist() == [0, 1, 3]
+    assert bucket_ts.tolist() == [0.0, 60.0, 180.0]
+
+
+def test_evaluate_drops_nan():
+    val = np.array([1.0, np.nan, 3.0], dtype=np.float32)
+    _, out = evaluate("avg_over_time", np.arange(3.0), val, 0.0)
+    assert out.tolist() == [2.0]
+
+
+def test_run_query_topk_by_peak_bucket():
+    store = HistoryStore()
+    for i in range(120):
+        store.record(float(i), {"a": 1.0, "b": 50.0 if i == 100 else 0.0, "c": 2.0})
+    out = run_query(store, "max_over_time", ["a", "b", "c"], 0, 200, step=60, k=2, resolution="raw")
+    assert [s.metric for s in out] == ["b", "c"]
+    assert out[0].value == 50.0
+    assert out[0].values == [0.0, 50.0]
+
+
+@pytest.mark.parametrize("topk", [0, -1])
+def test_query_endpoint_rejects_non_positive_topk(topk):
+    from fastapi.testclient import TestClient
+    from backend.api import app
+    response = TestClient(app).get("/api/query", params={"fn": "max_over_time", "metrics": "cpu.*", "topk": topk})
+    assert response.status_code == 422
@@ -0,0 +1,90 @@
+import time
+import pytest
+from backend import sampler as sampler_module
+from backend.sampler import LEASE_SECONDS, RELAX_STEP, Sampler
+
+
+class _FakeCollector:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: name
+
+
+@pytest.fixture
+def sampler(monkeypatch):
+    # Drive the control loop by hand: no background thread
+    monkeypatch.setattr(sampler_module.threading.Thread, "start", lambda self: None)
+    return Sampler(_FakeCollector(), budget=0.1)
+
+
+def _cost(sampler, **costs):
+    for name, cost in costs.items():
+        sampler.groups[name].cost = cost
+
+
+def test_sample_cost_includes_listeners(sampler):
+    group = sampler.groups["cpu"]
+    sampler.add_listener(lambda *_: sum(range(200000)), ["cpu"])
+    group.sample()
+    assert group.value == "get_cpu_info"
+    assert group.listener_cost > 0
+    assert group.cost >= group.listener_cost
+
+
+def test_lease_expiry_returns_group_to_idle(sampler):
+    sampler.touch("disk", "browser")
+    now = time.time()
+    sampler._update_targets(now)
+    disk = sampler.groups["disk"]
+    assert disk.target_interval == disk.base_interval and disk.watchers == 1
+    disk.backoff = 2.0
+    sampler._update_targets(now + LEASE_SECONDS * 10)
+    assert disk.target_interval is None and disk.effective_interval is None
+    assert disk.watchers == 0 and disk.backoff == 1.0
+    assert sampler._leases["disk"] == {}
+
+
+def test_subscription_interval_clamped_to_group_limits(sampler):
+    sampler.subscribe(["cpu"], interval=0.01)
+    sampler.subscribe(["services"], interval=1000)
+    sampler._update_targets(time.time())
+    assert sampler.groups["cpu"].target_interval == sampler.groups["cpu"].min_interval
+    assert sampler.groups["services"].target_interval == sampler.groups["services"].max_interval
+
+
+def test_expensive_groups_backed_off_first(sampler):
+    sampler.subscribe(["cpu", "connections"])
+    sampler._update_targets(time.time())
+    _cost(sampler, cpu=0.01, connections=0.6)  # 0.01 + 0.12 of a core
+    sampler._enforce_budget()
+    assert sampler.groups["cpu"].backoff == 1.0
+    assert sampler.groups["connections"].backoff > 1.0
+    assert sampler._estimated_usage() <= sampler.budget
+
+
+def test_backoff_stops_at_max_interval_then_moves_on(sampler):
+    sampler.subscribe(["cpu", "connections"])
+    sampler._update_targets(time.time())
+    _cost(sampler, cpu=0.05, connections=10.0)
+    sampler._enforce_budget()
+    connections = sampler.groups["connections"]
+    assert connections.effective_interval == connections.max_interval
+    assert sampler.groups["cpu"].backoff > 1.0
+    assert sampler._estimated_usage() <= sampler.budget
+
+
+def test_relaxes_cheapest_group_once_below_80_percent(sampler):
+    sampler.subscribe(["cpu", "connections"])
+    sampler._update_targets(time.time())
+    cpu, connections = sampler.groups["cpu"], sampler.groups["connections"]
+    cpu.backoff = connections.backoff = 4.0
+
+    # 90% of the budget: hold
+    _cost(sampler, cpu=0.0, connections=0.09 * connections.effective_interval)
+    sampler._enforce_budget()
+    assert cpu.backoff == connections.backoff == 4.0
+
+    _cost(sampler, cpu=0.001, connections=0.001)
+    sampler._enforce_budget()
+    assert cpu.backoff == 4.0 / RELAX_STEP and connections.backoff == 4.0
+    for _ in range(20): sampler._enforce_budget()
+    assert cpu.backoff == connections.backoff == 1.0
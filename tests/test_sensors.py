@@ -0,0 +1,43 @@
+from backend.sensors import SysfsSensorReader
+
+
+def _chip(root, entry, name, channels):
+    base = root / entry
+    base.mkdir(parents=True)
+    (base / "name").write_text(name + "\n")
+    for fname, text in channels.items():
+        (base / fname).write_text(text)
+
+
+def test_reads_labels_and_limits(tmp_path):
+    _chip(tmp_path / "hwmon", "hwmon0", "coretemp", {
+        "temp1_input": "45000\n", "temp1_label": "Package id 0\n", "temp1_max": "80000\n", "temp1_crit": "100000\n",
+        "fan1_input": "1200\n",
+    })
+    reader = SysfsSensorReader(str(tmp_path / "hwmon"), str(tmp_path / "thermal"))
+    temps, fans = reader.read()
+    reading = temps["coretemp"][0]
+    assert (reading.label, reading.current, reading.high, reading.critical) == ("Package id 0", 45.0, 80.0, 100.0)
+    assert fans["coretemp"][0].current == 1200
+    assert reader.cpu_temperature() == 45.0
+
+
+def test_failing_channel_is_quarantined_not_rediscovered(tmp_path):
+    # An unconnected probe: the file exists but its contents don't parse
+    _chip(tmp_path / "hwmon", "hwmon0", "nct6775", {"temp1_input": "31000\n", "temp2_input": "\n"})
+    reader = SysfsSensorReader(str(tmp_path / "hwmon"), str(tmp_path / "thermal"))
+    for _ in range(10):
+        temps, _ = reader.read()
+        assert [r.current for r in temps["nct6775"]] == [31.0]
+    assert reader.discoveries == 1
+
+
+def test_new_chip_triggers_rediscovery(tmp_path):
+    _chip(tmp_path / "hwmon", "hwmon0", "acpitz", {"temp1_input": "30000\n"})
+    reader = SysfsSensorReader(str(tmp_path / "hwmon"), str(tmp_path / "thermal"))
+    reader.read()
+    _chip(tmp_path / "hwmon", "hwmon1", "k10temp", {"temp1_input": "52000\n"})
+    reader._next_check = 0.0
+    temps, _ = reader.read()
+    assert set(temps) == {"acpitz", "k10temp"}
+    assert reader.discoveries == 2
@@ -0,0 +1,60 @@
+import struct
+import numpy as np
+from backend.wire import (
+    FRAME_DATA, FRAME_SCHEMA, HISTORY_MAGIC, MEDIA_TYPE, FrameEncoder, encode_history_table, wants_binary
+)
+
+
+def _frames(data: bytes):
+    out = []
+    while data:
+        length, kind, name_len, ncols, ts = struct.unpack_from("<IBBHd", data)
+        assert length % 4 == 0
+        name = data[16:16 + name_len].decode()
+        body = data[16 + (-(-name_len // 4) * 4):length]
+        out.append((kind, name, ncols, ts, body))
+        data = data[length:]
+    return out
+
+
+def test_history_table_layout():
+    ts = np.array([100.0, 101.5, 103.0])
+    val = np.array([1.0, np.nan, 3.0], dtype=np.float32)
+    blob = encode_history_table("cpu.usage", ts, val)
+    magic, nrows, base, name_len, _ = struct.unpack_from("<4sIdHH", blob)
+    assert (magic, nrows, base, name_len) == (HISTORY_MAGIC, 3, 100.0, 9)
+    off = 20 + 12  # 9-byte name padded to 12
+    assert len(blob) % 4 == 0
+    rel = np.frombuffer(blob, "<f4", 3, off)
+    vals = np.frombuffer(blob, "<f4", 3, off + 12)
+    assert rel.tolist() == [0.0, 1.5, 3.0]
+    assert vals[0] == 1.0 and np.isnan(vals[1]) and vals[2] == 3.0
+
+
+def test_empty_history_table():
+    blob = encode_history_table("m", np.empty(0), np.empty(0, np.float32))
+    assert struct.unpack_from("<4sIdHH", blob)[1] == 0
+    assert len(blob) == 24
+
+
+def test_stream_sends_schema_only_when_columns_change():
+    enc = FrameEncoder()
+    first = _frames(enc.encode("cpu", 1.0, {"a": 1.0, "b": None}))
+    assert [f[0] for f in first] == [FRAME_SCHEMA, FRAME_DATA]
+    assert first[0][4].rstrip(b"\0").decode().split("\n") == ["a", "b"]
+    row = np.frombuffer(first[1][4], "<f4")
+    assert row[0] == 1.0 and np.isnan(row[1])
+
+    again = _frames(enc.encode("cpu", 2.0, {"a": 2.0, "b": 3.0}))
+    assert [f[0] for f in again] == [FRAME_DATA]
+    assert again[0][3] == 2.0
+
+    changed = _frames(enc.encode("cpu", 3.0, {"a": 2.0, "c": 3.0}))
+    assert [f[0] for f in changed] == [FRAME_SCHEMA, FRAME_DATA]
+
+
+def test_wants_binary():
+    assert wants_binary(None, "bin")
+    assert not wants_binary(MEDIA_TYPE, "json")
+    assert wants_binary(f"{MEDIA_TYPE}, */*", None)
+    assert not wants_binary("application/json", None)